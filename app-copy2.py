@@ -15,6 +15,8 @@ import firebase_admin
 from firebase_admin import credentials, firestore
 from google.cloud.firestore_v1.base_query import FieldFilter, Or, And
 
+from eris.ingest import CTD, WEATHER, FrameSink, run
+
 from streamlit_folium import st_folium, folium_static
 import threading
 import random
@@ -106,72 +108,23 @@ yesterday = currentdate - timedelta(days= 1) #one day less than current date (fo
 
 
 
+def as_live_frame(df):
+    # Shared ingest frames carry a UTC "date"; the page plots a naive "datetime"
+    df = df.rename(columns={"date": "datetime"})
+    df["datetime"] = df["datetime"].dt.tz_convert(None)
+    return df
+
+
 # --- Cached: quarter start → yesterday ---
 @st.cache_data
 def cache_ctd_data(quarterstart, currentdate):
-    quarterstart_ms = int(quarterstart.timestamp() * 1000)
-    currentdate_ms = int(currentdate.timestamp() * 1000)
-    #yesterday_ms = int(yesterday.timestamp() * 1000)
-    docs = db.collection("CTD_Data").where("date", ">=" , quarterstart_ms ).where('date', '<' , currentdate_ms).order_by("date").get()
-    data = []
-    for doc in docs:
-        d = doc.to_dict()
-        try:
-            ts = d.get("date", {}).get("$date" )
-            if ts is None:
-                continue
-            record = {
-                "datetime": datetime.fromtimestamp(ts / 1000),
-                "instrument": d.get("instrument"),
-                "lat": d.get("lat"),
-                "lon": d.get("lon"),
-                "depth1": d.get("depth1"),
-                "oxygen": d.get("oxygen"),
-                "conductivity": float(d.get("conductivity", "nan")),
-                "par": float(d.get("par", "nan")),
-                "pressure": float(d.get("pressure", "nan")),
-                "salinity": float(d.get("salinity", "nan")),
-                "temperature": float(d.get("temperature", "nan")),
-                "turbidity": float(d.get("turbidity", "nan")),
-            }
-            data.append(record)
-        except Exception as e:
-            print(f"Error processing document: {e}")
-            continue
-    return pd.DataFrame(data)
+    return as_live_frame(run(db, CTD, FrameSink(), start=quarterstart, end=currentdate))
 
 
 # --- Live: today → now ---
 @st.cache_data(ttl=60)
 def fetch_today_ctd_data(currentdate):
-    currentdate_ms = int(currentdate.timestamp() * 1000)
-    docs = db.collection("CTD_Data").where("date", ">=", currentdate_ms).order_by("date").get()
-    data = []
-    for doc in docs:
-        d = doc.to_dict()
-        try:
-            ts = d.get("date", {}).get("$date")
-            if ts is None:
-                continue
-            record = {
-                "datetime": datetime.fromtimestamp(ts / 1000),
-                "instrument": d.get("instrument"),
-                "lat": d.get("lat"),
-                "lon": d.get("lon"),
-                "depth1": d.get("depth1"),
-                "oxygen": d.get("oxygen"),
-                "conductivity": float(d.get("conductivity", "nan")),
-                "par": float(d.get("par", "nan")),
-                "pressure": float(d.get("pressure", "nan")),
-                "salinity": float(d.get("salinity", "nan")),
-                "temperature": float(d.get("temperature", "nan")),
-                "turbidity": float(d.get("turbidity", "nan")),
-            }
-            data.append(record)
-        except Exception as e:
-            print(f"Error processing document: {e}")
-            continue
-    return pd.DataFrame(data)
+    return as_live_frame(run(db, CTD, FrameSink(), start=currentdate))
 
 
 
@@ -194,37 +147,11 @@ def fetch_ctd_data():
 
 
 # --- Function to fetch Weather Station data from Firebase ---
-#def fetch_weather_data():
-    docs = db.collection("Weather_Data").where("timestamp", ">=", currentdate).order_by("timestamp").get()
-    data = []
-    for doc in docs:
-        d = doc.to_dict()
-        try:
-            ts = d.get("timestamp")
-            if ts is None:
-                continue
-            record = {
-                "datetime":   ts,
-                "temp_out":   float(d.get("temp_out", "nan")),
-                "temp_hi":    float(d.get("temp_hi", "nan")),
-                "temp_low":   float(d.get("temp_low", "nan")),
-                "out_hum":    float(d.get("out_hum", "nan")),
-                "dew_pt":     float(d.get("dew_pt", "nan")),
-                "wind_speed": float(d.get("wind_speed", "nan")),
-                "wind_dir":   d.get("wind_dir"),
-                "bar":        float(d.get("bar", "nan")),
-                "rain":       float(d.get("rain", "nan")),
-                "rain_rate":  float(d.get("rain_rate", "nan")),
-                "heat_index": float(d.get("heat_index", "nan")),
-                "wind_chill": float(d.get("wind_chill", "nan")),
-                "in_temp":    float(d.get("in_temp", "nan")),
-                "in_hum":     float(d.get("in_hum", "nan")),
-            }
-            data.append(record)
-        except Exception as e:
-            print(f"Error processing weather document: {e}")
-            continue
-    return pd.DataFrame(data) if data else None
+@st.cache_data(ttl=60)
+def fetch_weather_data():
+    df = run(db, WEATHER, FrameSink(), start=currentdate)
+    df["datetime"] = df["datetime"].dt.tz_convert(None)
+    return df if not df.empty else None
 
 # Load CSV data for each graph
 ctd_csv_file_path = 'ERIS_data_2015-2024.csv'
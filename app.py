@@ -5,17 +5,17 @@ import folium
 from streamlit_folium import st_folium
 import time
 import os
-import base64
 import threading
 import random
 
-# Function to encode images to base64
-def get_base64_image(image_path):
-    try:
-        with open(image_path, "rb") as img_file:
-            return base64.b64encode(img_file.read()).decode()
-    except FileNotFoundError:
-        return None  # Return None if image doesn't exist
+from eris.archive import ARCHIVE_DIR, archive_bounds, load_ctd, range_version
+from eris.assets import image_src
+from eris.charts import add_series
+from eris.diskcache import default_cache, disk_cached
+from eris.downsample import DEFAULT_POINTS
+from eris.export import FORMATS, archive_export, deferred, export_name
+from eris.rollup import LABELS, choose_resolution, load_rollup, max_gap, mean_frame, rollup_version
+from eris.table import paginated_table
 
 # Set wide layout for the Streamlit page
 st.set_page_config(layout="wide")
@@ -71,8 +71,22 @@ st.sidebar.title("Navigation")
 # Sidebar navigation dropdown (No "Go to" label, fixed spacing)
 page = st.sidebar.selectbox("Select Page", ["Main Page", "Instrument Data"])
 
-# Load CSV data for each graph
-ctd_csv_file_path = 'ERIS_data_2015-2024.csv'  # Replace with the actual path of the CTD CSV
+# Historical CTD data lives in the Parquet archive built by eris/archive.py;
+# ``segments`` (see ``range_version``) changes when rows are added to the range
+@st.cache_data(ttl=3600, max_entries=16)
+@disk_cached("ctd_range")
+def load_ctd_range(start, end, segments, columns=None):
+    return load_ctd(start, end, columns)
+
+@st.cache_data(ttl=600)
+def ctd_archive_bounds():
+    return archive_bounds()
+
+# Hourly/daily/monthly means for long ranges (built by eris/rollup.py)
+# ``files`` (see ``rollup_version``) changes when a sync rewrites one of the months
+@st.cache_data(ttl=3600, max_entries=16)
+def load_rollup_range(resolution, start, end, files):
+    return mean_frame(load_rollup(resolution, start, end))
 
 
 # Main Page
@@ -126,11 +140,11 @@ if page == "Main Page":
     left_logo_path = "images/OceanTech Logo-PURPLE.png" 
     right_logo_path = "images/OceanTech Logo-PURPLE.png"  
 
-    # ✅ **Convert images to base64**
+    # ✅ **Images are served as content-hashed static files**
     if valid_photos:
-        base64_image = get_base64_image(valid_photos[st.session_state.current_index])
-        left_logo = get_base64_image(left_logo_path)
-        right_logo = get_base64_image(right_logo_path)
+        slide_src = image_src(valid_photos[st.session_state.current_index])
+        left_logo = image_src(left_logo_path)
+        right_logo = image_src(right_logo_path)
 
         st.markdown(
             f"""
@@ -170,9 +184,9 @@ if page == "Main Page":
             }}
             </style>
             <div class="slider-container">
-                {'<img src="data:image/png;base64,' + left_logo + '" class="logo">' if left_logo else ''}
-                <img src="data:image/jpeg;base64,{base64_image}" class="slide-image" key="{st.session_state.animation_key}">
-                {'<img src="data:image/png;base64,' + right_logo + '" class="logo">' if right_logo else ''}
+                {'<img src="' + left_logo + '" class="logo">' if left_logo else ''}
+                <img src="{slide_src}" class="slide-image" key="{st.session_state.animation_key}">
+                {'<img src="' + right_logo + '" class="logo">' if right_logo else ''}
             </div>
             <p class="caption">{valid_captions[st.session_state.current_index]}</p>
             """,
@@ -258,12 +272,12 @@ if page == "Main Page":
 
 # ✅ Instrument Data Page
 if page == "Instrument Data":
-    # Convert logo to Base64
+    # Logo is served as a content-hashed static file
     logo_path = "images/OceanTech Logo-PURPLE.png"
-    base64_logo = get_base64_image(logo_path)
+    logo_src = image_src(logo_path)
 
-    if base64_logo:
-        logo_html = f"<img src='data:image/png;base64,{base64_logo}' style='width:150px; height:auto;'>"
+    if logo_src:
+        logo_html = f"<img src='{logo_src}' style='width:150px; height:auto;'>"
     else:
         logo_html = "⚠️ Logo Not Found"
 
@@ -279,19 +293,11 @@ if page == "Instrument Data":
         unsafe_allow_html=True
     )
 
-    # ✅ Load and prepare CTD data
-    ctd_data = pd.read_csv(ctd_csv_file_path)
-
-    # Convert to datetime and clean
-    ctd_data['date'] = pd.to_datetime(ctd_data['date'], errors='coerce')
-    ctd_data = ctd_data.dropna(subset=['date'])
-    ctd_data.rename(columns={'date': 'time'}, inplace=True)
-
-    # ✅ Clean numeric columns, but preserve rows
-    for col in ['temperature', 'conductivity', 'par', 'turbidity', 'salinity', 'pressure', 'oxygen']:
-        if col in ctd_data.columns:
-            ctd_data[col] = pd.to_numeric(ctd_data[col], errors='coerce')
-            ctd_data.loc[(ctd_data[col] < -1000) | (ctd_data[col] > 1000), col] = pd.NA
+    # ✅ Archive extent comes from Parquet footers, no rows are read here
+    first_time, last_time = ctd_archive_bounds()
+    if last_time is None:
+        st.error(f"No archived CTD data found in {ARCHIVE_DIR}. Run: python -m eris.archive ERIS_data_2015-2024.csv")
+        st.stop()
 
     # ✅ Date range filtering UI
     st.write("### Date Range Selection")
@@ -304,28 +310,40 @@ if page == "Instrument Data":
     start_date = pd.to_datetime(start_date).tz_localize('UTC')
 
 # Similarly for end_date (assuming you want timezone-aware)
-    end_date = st.date_input("End Date", value=ctd_data['time'].max().date())
+    end_date = st.date_input("End Date", value=last_time.date())
     end_date = pd.to_datetime(end_date).tz_localize('UTC')
 
 
-    # ✅ Filter data within date range
-    filtered_ctd_data = ctd_data[
-        (ctd_data['time'] >= start_date) &
-        (ctd_data['time'] <= end_date)
-    ].sort_values('time')
+    range_end = end_date + pd.Timedelta(days=1)
 
     # ✅ OPTIONAL: Interpolate missing values (if desired)
     # filtered_ctd_data = filtered_ctd_data.interpolate(method="time")
 
-    # ✅ Plotting
+    # ✅ Plotting (each series is downsampled to a screen-sized number of points
+    # unless every sample is requested; large traces then switch to WebGL)
+    full_resolution = st.checkbox("Show every sample (slower for long ranges)", value=False)
+    max_points = None if full_resolution else DEFAULT_POINTS
+
+    # ✅ Long ranges are drawn from the pre-aggregated rollups instead of raw samples;
+    # their raw rows (only the months/row groups inside the range) are loaded for the table on request
+    resolution = "raw" if full_resolution else choose_resolution(start_date, range_end)
+    filtered_ctd_data = None
+    chart_data = load_rollup_range(resolution, start_date, range_end, rollup_version(resolution, start_date, range_end)) if resolution != "raw" else None
+    if chart_data is not None and not chart_data.empty:
+        chart_data, chart_gap = chart_data.rename(columns={'date': 'time'}), max_gap(resolution)
+        st.caption(f"{LABELS[resolution]} means ({len(chart_data):,} points) for this range.")
+    else:
+        filtered_ctd_data = load_ctd_range(start_date, range_end, range_version(start_date, range_end)).rename(columns={'date': 'time'})
+        chart_data, chart_gap = filtered_ctd_data, None
+
     fig1 = go.Figure()
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['temperature'], mode='lines', name='Temperature', line=dict(color='blue')))
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['conductivity'], mode='lines', name='Conductivity', line=dict(color='purple')))
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['par'], mode='lines', name='PAR', line=dict(color='green')))
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['turbidity'], mode='lines', name='Turbidity', line=dict(color='red')))
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['salinity'], mode='lines', name='Salinity', line=dict(color='orange')))
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['pressure'], mode='lines', name='Pressure', line=dict(color='black')))
-    fig1.add_trace(go.Scatter(x=filtered_ctd_data['time'], y=filtered_ctd_data['oxygen'], mode='lines', name='Oxygen', line=dict(color='gold')))
+    add_series(fig1, chart_data, 'time', 'temperature', 'Temperature', 'blue', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'conductivity', 'Conductivity', 'purple', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'par', 'PAR', 'green', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'turbidity', 'Turbidity', 'red', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'salinity', 'Salinity', 'orange', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'pressure', 'Pressure', 'black', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'oxygen', 'Oxygen', 'gold', max_points=max_points, max_gap=chart_gap)
 
     # ✅ Layout config
     fig1.update_layout(
@@ -377,6 +395,19 @@ if page == "Instrument Data":
 
     # ✅ Table & download
     columns_to_display = ['time', 'instrument', 'lat', 'lon', 'depth1', 'oxygen', 'conductivity', 'par', 'pressure', 'salinity', 'temperature', 'turbidity']
-    filtered_display_data = filtered_ctd_data[columns_to_display]
-    st.dataframe(filtered_display_data)
-    st.download_button("Download CTD Data", filtered_display_data.to_csv(index=False), "ctd_data.csv")
+    export_format = st.radio("Download format", list(FORMATS), format_func=lambda f: FORMATS[f].label, horizontal=True)
+    st.download_button(
+        "Download CTD Data",
+        deferred(archive_export, start_date, range_end, export_format, columns_to_display),
+        export_name("ctd_data", export_format),
+        mime=FORMATS[export_format].mime,
+    )
+    if filtered_ctd_data is None and st.checkbox("Show individual readings (loads every row in the range)", value=False):
+        filtered_ctd_data = load_ctd_range(start_date, range_end, range_version(start_date, range_end)).rename(columns={'date': 'time'})
+    if filtered_ctd_data is not None:
+        paginated_table(filtered_ctd_data[columns_to_display], key="ctd_history")
+
+
+# Disk cache counters (per server process)
+cache_stats = default_cache.stats()
+st.sidebar.caption(f"Disk cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} files")
@@ -0,0 +1 @@
+"""Data helpers shared by the ERIS Streamlit app and the append script."""
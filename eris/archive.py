@@ -0,0 +1,537 @@
+"""Partitioned Parquet archives of the CTD and weather records: monthly folders of immutable segments.
+
+Convert the old CSV once with::
+
+    python -m eris.archive ERIS_data_2015-2024.csv
+"""
+import argparse
+import contextlib
+import fcntl
+import itertools
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+ARCHIVE_DIR = os.path.join("data", "ctd")
+
+SENSOR_COLUMNS = ["temperature", "conductivity", "par", "turbidity", "salinity", "pressure", "oxygen"]
+CTD_COLUMNS = ["date", "instrument", "lat", "lon", "depth1"] + SENSOR_COLUMNS
+
+CTD_SCHEMA = pa.schema(
+    [
+        ("date", pa.int64()),
+        ("instrument", pa.string()),
+        ("lat", pa.float64()),
+        ("lon", pa.float64()),
+        ("depth1", pa.float32()),
+    ]
+    + [(col, pa.float32()) for col in SENSOR_COLUMNS]
+)
+
+WEATHER_DIR = os.path.join("data", "weather")
+
+# Same readings as the Firestore Weather_Data documents (eris.ingest.WEATHER)
+WEATHER_READINGS = [
+    "temp_out", "temp_hi", "temp_low", "out_hum", "dew_pt", "wind_speed", "bar",
+    "rain", "rain_rate", "heat_index", "wind_chill", "in_temp", "in_hum",
+]
+WEATHER_COLUMNS = ["date"] + WEATHER_READINGS + ["wind_dir"]
+
+WEATHER_SCHEMA = pa.schema(
+    [("date", pa.int64())] + [(col, pa.float32()) for col in WEATHER_READINGS] + [("wind_dir", pa.string())]
+)
+
+# Readings outside this range are sensor glitches (e.g. -9999 fill values)
+VALID_RANGE = (-1000, 1000)
+
+ROW_GROUP_SIZE = 50_000
+
+# Last ingested Firestore reading, see eris/sync.py
+WATERMARK_FILE = "_watermark.json"
+
+# Live segment files per partition
+MANIFEST_FILE = "_manifest.json"
+
+# A partition is compacted once it has this many segments
+COMPACT_SEGMENTS = 8
+
+# Seconds before a file no longer in the manifest is deleted, so a reader
+# that listed it just before a compaction can still open it
+GARBAGE_GRACE = 600
+
+# Serializes manifest updates within the process (worker threads); a
+# flock on the lock file does the same across processes (the app and a
+# backfill) and is released by the OS if its holder dies
+_manifest_lock = threading.Lock()
+LOCK_FILE = "_manifest.lock"
+
+# Archive roots whose lock the current thread holds (the lock is reentrant)
+_held = threading.local()
+
+
+def clean_ctd_frame(df):
+    """Coerce a raw CTD frame (CSV or Firestore) into the archive schema.
+
+    ``date`` may hold strings, datetimes or epoch milliseconds; rows whose
+    date cannot be parsed are dropped.
+    """
+    df = df.copy()
+    for col in CTD_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+
+    if pd.api.types.is_numeric_dtype(df["date"]):
+        dates = pd.to_datetime(df["date"], unit="ms", utc=True, errors="coerce")
+    else:
+        dates = pd.to_datetime(df["date"], utc=True, errors="coerce", format="mixed")
+    df["date"] = dates
+    df = df.dropna(subset=["date"])
+    df["date"] = df["date"].astype("datetime64[ms, UTC]").astype("int64")
+
+    for col in ["lat", "lon", "depth1"] + SENSOR_COLUMNS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    for col in SENSOR_COLUMNS:
+        df.loc[(df[col] < VALID_RANGE[0]) | (df[col] > VALID_RANGE[1]), col] = np.nan
+
+    df["instrument"] = df["instrument"].astype("string")
+    df = df[CTD_COLUMNS].sort_values("date", kind="stable").reset_index(drop=True)
+    return df
+
+
+def clean_weather_frame(df):
+    """Coerce a weather frame (WeatherLink export or Firestore) into ``WEATHER_SCHEMA``.
+
+    The time may be in ``datetime`` (as both sources produce) or ``date``.
+    """
+    df = df.rename(columns={"datetime": "date"})
+    for col in WEATHER_COLUMNS:
+        if col not in df.columns:
+            df[col] = np.nan
+    dates = pd.to_datetime(df["date"], utc=True, errors="coerce")
+    df = df.assign(date=dates).dropna(subset=["date"])
+    df["date"] = df["date"].astype("datetime64[ms, UTC]").astype("int64")
+    for col in WEATHER_READINGS:
+        df[col] = pd.to_numeric(df[col], errors="coerce")
+    df["wind_dir"] = df["wind_dir"].astype("string")
+    return df[WEATHER_COLUMNS].sort_values("date", kind="stable").reset_index(drop=True)
+
+
+def drop_repeats(df):
+    """A cleaned frame without repeated (instrument, date) readings; the first one is kept."""
+    return df[~df.duplicated([col for col in ("instrument", "date") if col in df.columns])]
+
+
+def partition_key(year, month):
+    return f"year={year:04d}/month={month:02d}"
+
+
+def partition_path(root, year, month):
+    return os.path.join(root, f"year={year:04d}", f"month={month:02d}")
+
+
+def replace_atomically(tmp, path):
+    """Flush ``tmp`` to disk and rename it over ``path``."""
+    with open(tmp, "rb") as f:
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def scan_segments(root=ARCHIVE_DIR):
+    """{partition key: [segment names]} from a directory listing (archives without a manifest)."""
+    segments = {}
+    if not os.path.isdir(root):
+        return segments
+    for year_dir in sorted(os.listdir(root)):
+        if not year_dir.startswith("year="):
+            continue
+        for month_dir in sorted(os.listdir(os.path.join(root, year_dir))):
+            path = os.path.join(root, year_dir, month_dir)
+            if not month_dir.startswith("month=") or not os.path.isdir(path):
+                continue
+            names = sorted(f for f in os.listdir(path) if f.endswith(".parquet"))
+            if names:
+                segments[f"{year_dir}/{month_dir}"] = names
+    return segments
+
+
+def read_manifest(root=ARCHIVE_DIR):
+    """{partition key: [segment names]} of the live segments, oldest partition first."""
+    try:
+        with open(os.path.join(root, MANIFEST_FILE)) as f:
+            segments = json.load(f)["segments"]
+    except FileNotFoundError:
+        segments = scan_segments(root)
+    return dict(sorted(segments.items()))
+
+
+def write_manifest(segments, root=ARCHIVE_DIR):
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, MANIFEST_FILE)
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"segments": {k: v for k, v in sorted(segments.items()) if v}, "updated": datetime.utcnow().isoformat()}, f)
+    replace_atomically(tmp, path)
+
+
+@contextlib.contextmanager
+def manifest_lock(root=ARCHIVE_DIR):
+    """Exclusive access to the archive's manifest across threads and processes.
+
+    Reentrant within a thread, so a check-then-append can hold it throughout.
+    """
+    held = _held.__dict__.setdefault("roots", set())
+    root_id = os.path.abspath(root)
+    if root_id in held:
+        yield
+        return
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, LOCK_FILE)
+    with _manifest_lock:
+        fd = os.open(path, os.O_CREAT | os.O_RDWR)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            held.add(root_id)
+            try:
+                yield
+            finally:
+                held.discard(root_id)
+                fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+
+def ensure_manifest(root=ARCHIVE_DIR):
+    """Record the segments already on disk before the first write adds new ones."""
+    with manifest_lock(root):
+        if not os.path.exists(os.path.join(root, MANIFEST_FILE)):
+            write_manifest(scan_segments(root), root)
+
+
+def update_manifest(change, root=ARCHIVE_DIR):
+    """Apply ``change(segments)`` (mutating the dict) and publish the result atomically."""
+    with manifest_lock(root):
+        segments = read_manifest(root)
+        change(segments)
+        write_manifest(segments, root)
+
+
+def write_segment(table, root, key):
+    """Write a date-sorted table as a new immutable segment of partition ``key``; returns its name."""
+    path = os.path.join(root, *key.split("/"))
+    os.makedirs(path, exist_ok=True)
+    dates = table.column("date")
+    # The random suffix keeps names unique across concurrent writers
+    name = f"part-{dates[0].as_py()}-{dates[-1].as_py()}-{uuid.uuid4().hex[:12]}.parquet"
+    target = os.path.join(path, name)
+    tmp = f"{target}.{os.getpid()}.tmp"
+    pq.write_table(table, tmp, row_group_size=ROW_GROUP_SIZE)
+    replace_atomically(tmp, target)
+    return name
+
+
+def month_parts(df, schema=CTD_SCHEMA):
+    """(partition key, table sorted by date) for each month in a cleaned frame."""
+    df = df.sort_values("date", kind="stable")
+    dates = pd.to_datetime(df["date"], unit="ms", utc=True)
+    for (year, month), part in df.groupby([dates.dt.year, dates.dt.month], sort=True):
+        yield partition_key(year, month), pa.Table.from_pandas(part, schema=schema, preserve_index=False)
+
+
+def append_rows(df, root=ARCHIVE_DIR, schema=CTD_SCHEMA):
+    """Add cleaned rows to an archive in O(new rows).
+
+    Each touched partition gets a new sorted segment; all of them are
+    published together by one manifest update.
+    """
+    ensure_manifest(root)
+    written = {}
+    for key, table in month_parts(df, schema):
+        written[key] = write_segment(table, root, key)
+
+    def add(segments):
+        for key, name in written.items():
+            segments.setdefault(key, []).append(name)
+
+    update_manifest(add, root)
+    return len(df)
+
+
+def append_ctd(df, root=ARCHIVE_DIR):
+    return append_rows(df, root, CTD_SCHEMA)
+
+
+def append_weather(df, root=WEATHER_DIR):
+    return append_rows(df, root, WEATHER_SCHEMA)
+
+
+def compact(root=ARCHIVE_DIR, min_segments=COMPACT_SEGMENTS):
+    """Merge the segments of each partition that has ``min_segments`` or more.
+
+    Segments appended while a partition is being merged are kept; if
+    another compactor replaced any of the merged segments in the meantime,
+    the merge is discarded. Returns the number of partitions compacted.
+    """
+    compacted = 0
+    for key, names in read_manifest(root).items():
+        if len(names) < min_segments:
+            continue
+        path = os.path.join(root, *key.split("/"))
+        table = pa.concat_tables([pq.read_table(os.path.join(path, name)) for name in names])
+        merged = write_segment(table.sort_by("date"), root, key)
+        with manifest_lock(root):
+            segments = read_manifest(root)
+            live = segments.get(key, [])
+            if not set(names) <= set(live):
+                # Another compactor replaced some of these segments first
+                os.remove(os.path.join(path, merged))
+                continue
+            segments[key] = [merged] + [n for n in live if n not in names]
+            write_manifest(segments, root)
+        compacted += 1
+    collect_garbage(root)
+    return compacted
+
+
+def collect_garbage(root=ARCHIVE_DIR, grace=GARBAGE_GRACE):
+    """Delete segment and temp files not in the manifest that are older than ``grace`` seconds."""
+    if not os.path.exists(os.path.join(root, MANIFEST_FILE)):
+        return 0
+    live = {f"{key}/{name}" for key, names in read_manifest(root).items() for name in names}
+    cutoff = time.time() - grace
+    removed = 0
+    for key, names in scan_segments(root).items():
+        path = os.path.join(root, *key.split("/"))
+        for name in os.listdir(path):
+            file = os.path.join(path, name)
+            if f"{key}/{name}" in live or not name.endswith((".parquet", ".tmp")):
+                continue
+            if os.path.getmtime(file) < cutoff:
+                os.remove(file)
+                removed += 1
+    return removed
+
+
+def convert_csv(csv_path, root=ARCHIVE_DIR):
+    """Add ERIS_data_2015-2024.csv to the archive through the dedup index.
+
+    Readings already archived (e.g. synced from Firestore) are kept as they
+    are. Returns (records written, duplicate readings dropped).
+    """
+    from eris.dedup import index_for
+
+    df = clean_ctd_frame(pd.read_csv(csv_path, low_memory=False))
+    new = index_for(root).append_new(df, os.path.basename(csv_path), append_ctd)
+    return len(new), len(df) - len(new)
+
+
+def to_epoch_ms(value):
+    """Epoch milliseconds for a date/datetime/string; naive values are taken as UTC."""
+    ts = pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return int(ts.value // 1_000_000)
+
+
+def partition_files(root=ARCHIVE_DIR, start_ms=None, end_ms=None):
+    """Live segment files in the archive (per the manifest), oldest partition first.
+
+    Month partitions entirely outside ``[start_ms, end_ms)`` are skipped
+    without being opened.
+    """
+    files = []
+    for key, names in live_partitions(root, start_ms, end_ms).items():
+        path = os.path.join(root, *key.split("/"))
+        files.extend(os.path.join(path, name) for name in names)
+    return files
+
+
+def live_partitions(root=ARCHIVE_DIR, start_ms=None, end_ms=None):
+    """{partition key: [segment names]} of the manifest for the months overlapping ``[start_ms, end_ms)``."""
+    first = last = None
+    if start_ms is not None:
+        ts = pd.Timestamp(start_ms, unit="ms")
+        first = (ts.year, ts.month)
+    if end_ms is not None:
+        ts = pd.Timestamp(end_ms - 1, unit="ms")
+        last = (ts.year, ts.month)
+    partitions = {}
+    for key, names in read_manifest(root).items():
+        year_dir, month_dir = key.split("/")
+        period = (int(year_dir[5:]), int(month_dir[6:]))
+        if (first is not None and period < first) or (last is not None and period > last):
+            continue
+        partitions[key] = names
+    return partitions
+
+
+def range_version(start=None, end=None, root=ARCHIVE_DIR):
+    """Hashable version of the rows in ``[start, end)``: the live segments of the months it touches.
+
+    It only changes when a segment is added to or compacted in one of those
+    months, so caches keyed on it stay valid for closed ranges.
+    """
+    start_ms = to_epoch_ms(start) if start is not None else None
+    end_ms = to_epoch_ms(end) if end is not None else None
+    return tuple((key, tuple(names)) for key, names in live_partitions(root, start_ms, end_ms).items())
+
+
+def archive_bounds(root=ARCHIVE_DIR):
+    """(first, last) timestamp in the archive, read from Parquet footers only.
+
+    Segments overlap in time, so every segment of the first and last
+    partitions is looked at.
+    """
+    partitions = read_manifest(root)
+    if not partitions:
+        return None, None
+    keys = list(partitions)
+    files = [os.path.join(root, *key.split("/"), name) for key in dict.fromkeys([keys[0], keys[-1]]) for name in partitions[key]]
+    lo, hi = [], []
+    for path in files:
+        meta = pq.ParquetFile(path).metadata
+        col = meta.schema.names.index("date")
+        for i in range(meta.num_row_groups):
+            stats = meta.row_group(i).column(col).statistics
+            if stats is not None and stats.has_min_max:
+                lo.append(stats.min)
+                hi.append(stats.max)
+    if not lo:
+        return None, None
+    return pd.Timestamp(min(lo), unit="ms", tz="UTC"), pd.Timestamp(max(hi), unit="ms", tz="UTC")
+
+
+def read_watermark(root=ARCHIVE_DIR, key="CTD_Data"):
+    """Last ingested epoch-ms, falling back to the newest archived reading."""
+    try:
+        with open(os.path.join(root, WATERMARK_FILE)) as f:
+            return int(json.load(f)[key])
+    except (FileNotFoundError, KeyError, ValueError):
+        pass
+    _, last = archive_bounds(root)
+    if last is not None:
+        return int(last.value // 1_000_000)
+    return None
+
+
+def write_watermark(value_ms, root=ARCHIVE_DIR, key="CTD_Data"):
+    """Persist the watermark atomically (write a temp file, then rename)."""
+    os.makedirs(root, exist_ok=True)
+    path = os.path.join(root, WATERMARK_FILE)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, "w") as f:
+        json.dump({key: int(value_ms), "updated": datetime.utcnow().isoformat()}, f)
+    replace_atomically(tmp, path)
+
+
+def raise_watermark(value_ms, root=ARCHIVE_DIR, key="CTD_Data"):
+    """Move the watermark up to ``value_ms``, never back; True if it moved.
+
+    The compare and the write run under the manifest lock, so concurrent
+    syncs (the worker, ERISAppendCode.py) cannot lower each other's mark.
+    """
+    with manifest_lock(root):
+        mark = read_watermark(root, key)
+        if mark is not None and value_ms <= mark:
+            return False
+        write_watermark(value_ms, root, key)
+        return True
+
+
+def to_frame(table):
+    """Convert an archive table to pandas with ``date`` as UTC datetimes."""
+    df = table.to_pandas()
+    if "date" in df.columns:
+        df["date"] = pd.to_datetime(df["date"], unit="ms", utc=True)
+    return df
+
+
+def load_rows(start=None, end=None, columns=None, root=ARCHIVE_DIR, schema=CTD_SCHEMA):
+    """Load archived rows with ``start <= date < end``.
+
+    Only the month partitions overlapping the window are opened, and the
+    date filter is pushed down to Parquet so row groups outside it are
+    skipped using their min/max statistics. ``columns`` limits the sensor
+    columns read; ``date`` is always returned.
+    """
+    if columns is not None:
+        columns = [c for c in schema.names if c in columns or c == "date"]
+    start_ms = to_epoch_ms(start) if start is not None else None
+    end_ms = to_epoch_ms(end) if end is not None else None
+
+    filters = []
+    if start_ms is not None:
+        filters.append(("date", ">=", start_ms))
+    if end_ms is not None:
+        filters.append(("date", "<", end_ms))
+
+    files = partition_files(root, start_ms, end_ms)
+    if not files:
+        return to_frame(schema.empty_table().select(columns or schema.names))
+    tables = [pq.read_table(f, columns=columns, filters=filters or None) for f in files]
+    df = to_frame(pa.concat_tables(tables))
+    if not df["date"].is_monotonic_increasing:
+        df = df.sort_values("date", kind="stable").reset_index(drop=True)
+    return df
+
+
+def load_ctd(start=None, end=None, columns=None, root=ARCHIVE_DIR):
+    return load_rows(start, end, columns, root, CTD_SCHEMA)
+
+
+def load_weather(start=None, end=None, columns=None, root=WEATHER_DIR):
+    return load_rows(start, end, columns, root, WEATHER_SCHEMA)
+
+
+def iter_ctd(start=None, end=None, columns=None, root=ARCHIVE_DIR):
+    """Like ``load_ctd`` but yields one sorted frame per month partition.
+
+    Lets exports walk a long range without holding all of it in memory.
+    Yields a single empty frame when nothing is archived in the range.
+    """
+    if columns is not None:
+        columns = [c for c in CTD_COLUMNS if c in columns or c == "date"]
+    start_ms = to_epoch_ms(start) if start is not None else None
+    end_ms = to_epoch_ms(end) if end is not None else None
+
+    filters = []
+    if start_ms is not None:
+        filters.append(("date", ">=", start_ms))
+    if end_ms is not None:
+        filters.append(("date", "<", end_ms))
+
+    found = False
+    for _, month_files in itertools.groupby(partition_files(root, start_ms, end_ms), os.path.dirname):
+        tables = [pq.read_table(f, columns=columns, filters=filters or None) for f in month_files]
+        df = to_frame(pa.concat_tables(tables))
+        if not df.empty:
+            found = True
+            yield df.sort_values("date", kind="stable").reset_index(drop=True)
+    if not found:
+        yield to_frame(CTD_SCHEMA.empty_table().select(columns or CTD_COLUMNS))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Convert the historical CTD CSV into the Parquet archive.")
+    parser.add_argument("csv_path", nargs="?", help="e.g. ERIS_data_2015-2024.csv")
+    parser.add_argument("--root", default=ARCHIVE_DIR, help="archive directory (default: %(default)s)")
+    parser.add_argument("--compact", action="store_true", help="merge every partition with more than one segment, then exit")
+    args = parser.parse_args()
+    if args.compact:
+        print(f"Compacted {compact(args.root, min_segments=2)} partitions")
+        raise SystemExit
+    if args.csv_path is None:
+        parser.error("csv_path is required unless --compact is given")
+    count, duplicates = convert_csv(args.csv_path, args.root)
+    print(f"Wrote {count} records to {args.root} ({duplicates} duplicates dropped)")
+
+    from eris.rollup import ROLLUP_DIR, rebuild
+    months = rebuild(args.root, os.path.join(os.path.dirname(os.path.normpath(args.root)), os.path.basename(ROLLUP_DIR)))
+    print(f"Built rollups for {months} months")
@@ -0,0 +1,98 @@
+"""Content-hashed static URLs for the site's images (``python -m eris.assets`` publishes them all)."""
+import base64
+import functools
+import hashlib
+import mimetypes
+import os
+import shutil
+
+import streamlit as st
+
+IMAGE_DIR = "images"
+STATIC_DIR = "static"
+ASSET_DIR = os.path.join(STATIC_DIR, "assets")
+URL_PREFIX = "app/static/assets"
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".gif", ".webp")
+
+
+def file_version(path):
+    """(mtime, size) of ``path``, or None if it does not exist."""
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return info.st_mtime_ns, info.st_size
+
+
+@functools.lru_cache(maxsize=256)
+def _content_hash(path, version):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:12]
+
+
+def content_hash(path):
+    version = file_version(path)
+    return _content_hash(path, version) if version else None
+
+
+def hashed_name(path):
+    stem, ext = os.path.splitext(os.path.basename(path))
+    return f"{stem.replace(' ', '-')}.{content_hash(path)}{ext.lower()}"
+
+
+def publish(path, asset_dir=ASSET_DIR):
+    """Copy ``path`` into ``asset_dir`` under its hashed name; returns that name."""
+    name = hashed_name(path)
+    target = os.path.join(asset_dir, name)
+    if not os.path.exists(target):
+        os.makedirs(asset_dir, exist_ok=True)
+        tmp = f"{target}.{os.getpid()}.tmp"
+        shutil.copyfile(path, tmp)
+        os.replace(tmp, target)
+    return name
+
+
+@functools.lru_cache(maxsize=64)
+def _data_uri(path, version):
+    mime = mimetypes.guess_type(path)[0] or "application/octet-stream"
+    with open(path, "rb") as f:
+        return f"data:{mime};base64,{base64.b64encode(f.read()).decode()}"
+
+
+def data_uri(path):
+    """Memoized base64 data URI for ``path`` (re-encoded only when the file changes)."""
+    version = file_version(path)
+    return _data_uri(path, version) if version else None
+
+
+def static_serving():
+    return bool(st.get_option("server.enableStaticServing"))
+
+
+def image_src(path):
+    """Value for an ``<img src>``: a hashed static URL, else a data URI; None if missing."""
+    if file_version(path) is None:
+        return None
+    if static_serving():
+        try:
+            return f"{URL_PREFIX}/{publish(path)}"
+        except OSError:
+            pass
+    return data_uri(path)
+
+
+def publish_all(image_dir=IMAGE_DIR, asset_dir=ASSET_DIR):
+    names = []
+    for name in sorted(os.listdir(image_dir)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            names.append(publish(os.path.join(image_dir, name), asset_dir))
+    return names
+
+
+if __name__ == "__main__":
+    published = publish_all()
+    print(f"Published {len(published)} images to {ASSET_DIR}")
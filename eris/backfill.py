@@ -0,0 +1,151 @@
+"""Resumable, concurrent backfill of a range of CTD readings from Firestore into the archive::
+
+    python -m eris.backfill 2025-01-01 2026-01-01
+"""
+import argparse
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+import pandas as pd
+
+from eris.archive import ARCHIVE_DIR, manifest_lock, read_watermark, replace_atomically, to_epoch_ms, write_watermark
+from eris.ingest import CTD, ArchiveSink, run
+from eris.rollup import ROLLUP_DIR, update_for_rows
+
+log = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "_backfill.json"
+
+# Shard length -> pandas frequency of the shard boundaries
+SHARDS = {"month": "MS", "week": "W-MON", "day": "D"}
+
+WORKERS = 4
+
+
+def shards(start, end, shard="month"):
+    """[(start_ms, end_ms), ...] covering ``[start, end)`` split at ``shard`` boundaries."""
+    start_ms, end_ms = to_epoch_ms(start), to_epoch_ms(end)
+    inner = pd.date_range(pd.Timestamp(start_ms, unit="ms"), pd.Timestamp(end_ms, unit="ms"), freq=SHARDS[shard])
+    edges = sorted({start_ms, end_ms, *(to_epoch_ms(ts) for ts in inner)})
+    return [(lo, hi) for lo, hi in zip(edges, edges[1:]) if lo < hi]
+
+
+def shard_id(shard):
+    return f"{shard[0]}-{shard[1]}"
+
+
+class Checkpoint:
+    """The shards already backfilled, persisted after each one completes."""
+
+    def __init__(self, root=ARCHIVE_DIR):
+        self.path = os.path.join(root, CHECKPOINT_FILE)
+        self.lock = threading.Lock()
+        try:
+            with open(self.path) as f:
+                self.done = set(json.load(f)["done"])
+        except (FileNotFoundError, KeyError, ValueError):
+            self.done = set()
+
+    def __contains__(self, shard):
+        return shard_id(shard) in self.done
+
+    def mark(self, shard):
+        with self.lock:
+            self.done.add(shard_id(shard))
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"done": sorted(self.done), "updated": datetime.utcnow().isoformat()}, f)
+            replace_atomically(tmp, self.path)
+
+    def clear(self):
+        with self.lock:
+            self.done = set()
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+def fetch_shard(db, shard, root, rollup_root):
+    """Archive one shard's readings; returns the new rows."""
+    lo, hi = shard
+    sink = ArchiveSink(root, source=f"backfill {pd.Timestamp(lo, unit='ms'):%Y-%m-%d}", advance_watermark=False)
+    new = run(db, CTD, sink, start=lo, end=hi)
+    update_for_rows(new, root, rollup_root)
+    return new
+
+
+def advance_watermark(start_ms, newest_ms, root=ARCHIVE_DIR):
+    """Move the watermark to ``newest_ms`` if the backfilled range continues the synced data."""
+    with manifest_lock(root):
+        mark = read_watermark(root, CTD.collection)
+        if mark is None or (start_ms <= mark + 1 and newest_ms > mark):
+            write_watermark(newest_ms, root)
+            return True
+    return False
+
+
+def backfill(db, start, end, shard="month", workers=WORKERS, root=ARCHIVE_DIR, rollup_root=ROLLUP_DIR, progress=None):
+    """Fetch every shard of ``[start, end)`` not yet checkpointed; returns the number of new rows.
+
+    ``progress(shard, new_rows, done, total)`` is called as shards finish.
+    Failed shards are logged and left for the next run.
+    """
+    checkpoint = Checkpoint(root)
+    todo = [s for s in shards(start, end, shard) if s not in checkpoint]
+    total = len(todo)
+    added = 0
+    newest = None
+    failed = 0
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backfill") as pool:
+        futures = {pool.submit(fetch_shard, db, s, root, rollup_root): s for s in todo}
+        for done, future in enumerate(as_completed(futures), 1):
+            s = futures[future]
+            try:
+                new = future.result()
+            except Exception as e:
+                failed += 1
+                log.error("Backfill shard %s failed: %s", shard_id(s), e)
+                continue
+            checkpoint.mark(s)
+            added += len(new)
+            if not new.empty:
+                newest = max(newest or 0, int(new["date"].max()))
+            if progress:
+                progress(s, len(new), done, total)
+    if failed:
+        # Leave the watermark alone: the sync must not skip the missing shards
+        raise RuntimeError(f"{failed} of {total} shards failed; rerun the same command to retry them")
+    if newest is not None:
+        advance_watermark(to_epoch_ms(start), newest, root)
+    return added
+
+
+if __name__ == "__main__":
+    from eris.dedup import index_for
+    from eris.firebase import get_db
+
+    parser = argparse.ArgumentParser(description="Backfill CTD readings from Firestore into the archive.")
+    parser.add_argument("start", help="first day, e.g. 2025-01-01")
+    parser.add_argument("end", help="day after the last one, e.g. 2026-01-01")
+    parser.add_argument("--shard", choices=list(SHARDS), default="month", help="shard length (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="concurrent shards (default: %(default)s)")
+    parser.add_argument("--root", default=ARCHIVE_DIR, help="archive directory (default: %(default)s)")
+    parser.add_argument("--restart", action="store_true", help="ignore the checkpoint and fetch every shard again")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.WARNING)
+
+    if args.restart:
+        Checkpoint(args.root).clear()
+
+    def report(shard, rows, done, total):
+        lo, hi = (pd.Timestamp(ms, unit="ms") for ms in shard)
+        print(f"[{done}/{total}] {lo:%Y-%m-%d} to {hi:%Y-%m-%d}: {rows} new records")
+
+    rollup_root = os.path.join(os.path.dirname(os.path.normpath(args.root)), os.path.basename(ROLLUP_DIR))
+    added = backfill(get_db(), args.start, args.end, args.shard, args.workers, args.root, rollup_root, report)
+    print(f"Backfilled {added} records into {args.root}")
+    for source, count in index_for(args.root).report().items():
+        print(f"{source}: {count} duplicate readings dropped")
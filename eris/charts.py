@@ -0,0 +1,61 @@
+"""Plotly trace helpers shared by the CTD and weather charts."""
+import numpy as np
+import plotly.graph_objs as go
+
+from eris.downsample import DEFAULT_POINTS, downsample
+
+# The CTD samples every 30 minutes; a longer pause means the instrument was down
+CTD_MAX_GAP = np.timedelta64(2, "h")
+
+# SVG rendering (go.Scatter) gets sluggish past ~10k points per trace;
+# above this many points a trace is drawn with WebGL (go.Scattergl) instead
+WEBGL_THRESHOLD = 10_000
+
+
+def as_x_array(series):
+    """Series -> NumPy x values (tz-aware datetimes become naive UTC datetime64)."""
+    if hasattr(series, "dt") and series.dt.tz is not None:
+        series = series.dt.tz_convert(None)
+    return series.to_numpy()
+
+
+def gap_series(x, y, max_gap=None):
+    """Line data with exactly one NaN separator per gap.
+
+    A gap is a run of missing readings or, with ``max_gap``, a pause between
+    consecutive samples longer than ``max_gap``. Plotly breaks a line at a
+    NaN, so one trace can draw every segment. Runs of NaNs collapse to one,
+    and leading/trailing NaNs are dropped.
+    """
+    x = np.asarray(x)
+    y = np.asarray(y, dtype="float64")
+    if max_gap is not None and len(x) > 1:
+        pauses = np.flatnonzero(np.diff(x) > max_gap) + 1
+        x = np.insert(x, pauses, x[pauses - 1])
+        y = np.insert(y, pauses, np.nan)
+    missing = np.isnan(y)
+    prev_valid = np.concatenate([[False], ~missing[:-1]])
+    next_valid = np.concatenate([~missing[1:], [False]])
+    # Keep valid points and the single NaN that opens each gap, if a line resumes after it
+    keep = ~missing | (prev_valid & np.logical_or.accumulate(next_valid[::-1])[::-1])
+    return x[keep], y[keep]
+
+
+def add_series(fig, df, x_col, y_col, name, color, max_points=DEFAULT_POINTS, method="lttb", max_gap=None,
+               webgl_threshold=WEBGL_THRESHOLD):
+    """Add one line trace for ``y_col``.
+
+    Gaps are turned into NaN separators (see ``gap_series``) on the raw
+    data, then the series is reduced to at most ~``max_points`` samples
+    (``None`` plots every sample), so each variable is a single trace
+    however fragmented it is. Traces with more than ``webgl_threshold``
+    points are rendered with WebGL.
+    """
+    x = as_x_array(df[x_col])
+    y = df[y_col].to_numpy(dtype="float64", na_value=np.nan)
+    x, y = gap_series(x, y, max_gap)
+    if max_points is not None:
+        keep = downsample(x, y, max_points, method)
+        x, y = gap_series(x[keep], y[keep])
+    trace = go.Scattergl if len(x) > webgl_threshold else go.Scatter
+    fig.add_trace(trace(x=x, y=y, mode='lines', name=name, line=dict(color=color)))
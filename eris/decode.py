@@ -0,0 +1,73 @@
+"""Column-at-a-time decoding of Firestore documents into DataFrames, with a report of rejected rows."""
+import logging
+from collections import namedtuple
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+# frame: decoded rows, rejected: (id, reason) per dropped document,
+# coerced: {column: count of present-but-non-numeric values turned into NaN}
+Decoded = namedtuple("Decoded", ["frame", "rejected", "coerced"])
+
+
+def get_path(d, path):
+    """``get_path(d, "date.$date")`` -> d["date"]["$date"], or None."""
+    for key in path.split("."):
+        if not isinstance(d, dict):
+            return None
+        d = d.get(key)
+    return d
+
+
+def to_datetime_column(values, unit=None):
+    """Convert raw timestamp values to a UTC datetime64 Series.
+
+    ``unit="ms"`` treats values as epoch milliseconds; otherwise values are
+    datetime-like (Firestore returns ``DatetimeWithNanoseconds``) or protobuf
+    style objects with ``seconds``/``nanos``.
+    """
+    if unit is not None:
+        return pd.to_datetime(pd.to_numeric(pd.Series(values, dtype=object), errors="coerce"), unit=unit, utc=True)
+    values = [
+        pd.Timestamp(v.seconds * 1_000_000_000 + getattr(v, "nanos", 0), tz="UTC")
+        if hasattr(v, "seconds") and not hasattr(v, "year") else v
+        for v in values
+    ]
+    return pd.to_datetime(pd.Series(values, dtype=object), utc=True, errors="coerce", format="mixed")
+
+
+def decode_documents(snapshots, time_field, time_column, numeric, text=(), time_unit=None):
+    """Decode Firestore snapshots into a frame sorted by ``time_column``."""
+    snapshots = list(snapshots)
+    docs = [snap.to_dict() or {} for snap in snapshots]
+    ids = [snap.id for snap in snapshots]
+    times = [get_path(d, time_field) for d in docs]
+    columns = {name: [d.get(name) for d in docs] for name in list(numeric) + list(text)}
+
+    frame = pd.DataFrame({time_column: to_datetime_column(times, time_unit)})
+    coerced = {}
+    for name in numeric:
+        raw = pd.Series(columns[name], dtype=object)
+        values = pd.to_numeric(raw, errors="coerce").astype("float64")
+        bad = int((values.isna() & raw.notna()).sum())
+        if bad:
+            coerced[name] = bad
+        frame[name] = values
+    for name in text:
+        frame[name] = pd.Series(columns[name], dtype=object).astype("string")
+
+    missing = pd.Series([t is None for t in times], dtype=bool)
+    invalid = frame[time_column].isna().to_numpy() & ~missing.to_numpy()
+    rejected = pd.DataFrame({"id": pd.Series(ids, dtype=object), "reason": None})
+    rejected.loc[missing.to_numpy(), "reason"] = f"missing {time_field}"
+    rejected.loc[invalid, "reason"] = f"unparseable {time_field}"
+    rejected = rejected.dropna(subset=["reason"]).reset_index(drop=True)
+
+    frame = frame[frame[time_column].notna()].sort_values(time_column, kind="stable").reset_index(drop=True)
+    if len(rejected) or coerced:
+        log.warning(
+            "Decoded %d documents: %d rejected, non-numeric values coerced to NaN: %s",
+            len(ids), len(rejected), coerced or "none",
+        )
+    return Decoded(frame, rejected, coerced)
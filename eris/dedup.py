@@ -0,0 +1,200 @@
+"""Persistent (instrument, epoch-ms) index of the archived readings.
+
+Every path that adds rows to an archive (the Firestore sync and backfill,
+``convert_csv``, ``import_file`` for the Raspberry Pi's ctddata.csv and
+output.json exports, the WeatherLink import) goes through
+``DedupIndex.append_new``, which runs ``drop_seen`` and the append under
+the manifest lock. It drops readings already archived and repeats within the batch, in
+O(new rows log partition) without reading the archive, and counts the
+duplicates per source (``report``).
+
+Per month partition the index is one sorted int64 array of composite keys
+``instrument code << TIME_BITS | epoch-ms``, saved as ``_keys.npz`` in the
+partition directory together with the segment names it covers. When those
+differ from the manifest (after a compaction, a rewrite, or a crash between
+publishing a segment and saving the index) the partition's keys are
+rebuilt from its ``date`` and ``instrument`` columns. The weather archive,
+which has no instrument column, is indexed on the time alone.
+"""
+import logging
+import os
+import threading
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from eris.archive import ARCHIVE_DIR, drop_repeats, manifest_lock, partition_key, read_manifest, replace_atomically
+
+log = logging.getLogger(__name__)
+
+KEYS_FILE = "_keys.npz"
+
+# Epoch-ms values stay below 2**42 until the year 2109
+TIME_BITS = 42
+
+_indexes = {}
+_indexes_lock = threading.Lock()
+
+
+def index_for(root=ARCHIVE_DIR):
+    """The process-wide index of the archive at ``root``."""
+    with _indexes_lock:
+        if root not in _indexes:
+            _indexes[root] = DedupIndex(root)
+        return _indexes[root]
+
+
+def instrument_names(df):
+    # Archives without an instrument column (weather) key on the time alone
+    if "instrument" not in df.columns:
+        return np.full(len(df), "", dtype=object)
+    return df["instrument"].astype("string").fillna("").to_numpy(dtype=object)
+
+
+class PartitionKeys:
+    def __init__(self, segments, instruments, keys):
+        self.segments = segments
+        self.instruments = instruments
+        self.keys = keys
+
+    def codes(self, names, add=False):
+        """Instrument code per name; -1 for names never seen (unless ``add``)."""
+        lookup = {name: i for i, name in enumerate(self.instruments)}
+        if add:
+            for name in dict.fromkeys(names):
+                if name not in lookup:
+                    lookup[name] = len(self.instruments)
+                    self.instruments.append(name)
+        return np.array([lookup.get(name, -1) for name in names], dtype=np.int64)
+
+    def contains(self, keys):
+        if not len(self.keys):
+            return np.zeros(len(keys), dtype=bool)
+        pos = np.minimum(np.searchsorted(self.keys, keys), len(self.keys) - 1)
+        return self.keys[pos] == keys
+
+
+def composite_keys(codes, dates):
+    return (codes << TIME_BITS) | dates.astype(np.int64)
+
+
+class DedupIndex:
+    def __init__(self, root=ARCHIVE_DIR):
+        self.root = root
+        self.partitions = {}
+        self.duplicates = Counter()
+        self.lock = threading.Lock()
+
+    def path(self, key):
+        return os.path.join(self.root, *key.split("/"), KEYS_FILE)
+
+    def _partition(self, key, segments):
+        cached = self.partitions.get(key)
+        if cached is not None and cached.segments == segments:
+            return cached
+        try:
+            with np.load(self.path(key)) as f:
+                if tuple(str(name) for name in f["segments"]) == segments:
+                    cached = PartitionKeys(segments, [str(name) for name in f["instruments"]], f["keys"])
+                else:
+                    cached = None
+        except (OSError, KeyError, ValueError):
+            cached = None
+        if cached is None:
+            cached = self._rebuild(key, segments)
+        self.partitions[key] = cached
+        return cached
+
+    def _rebuild(self, key, segments):
+        part = PartitionKeys(segments, [], np.empty(0, dtype=np.int64))
+        folder = os.path.join(self.root, *key.split("/"))
+        frames = []
+        for name in segments:
+            path = os.path.join(folder, name)
+            columns = [c for c in ("date", "instrument") if c in pq.read_schema(path).names]
+            frames.append(pq.read_table(path, columns=columns).to_pandas())
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            part.keys = np.unique(composite_keys(part.codes(instrument_names(df), add=True), df["date"].to_numpy()))
+        if segments:
+            self._save(key, part)
+        log.info("Rebuilt dedup index for %s (%d readings)", key, len(part.keys))
+        return part
+
+    def _save(self, key, part):
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            np.savez(
+                f,
+                segments=np.array(part.segments, dtype=str),
+                instruments=np.array(part.instruments, dtype=str),
+                keys=part.keys,
+            )
+        replace_atomically(tmp, path)
+
+    def drop_seen(self, df, source):
+        """Rows of a cleaned frame that are neither archived nor repeated in it.
+
+        The count of dropped rows is added to ``duplicates[source]``.
+        """
+        if df.empty:
+            return df
+        fresh = drop_repeats(df)
+        manifest = read_manifest(self.root)
+        dates = pd.to_datetime(fresh["date"], unit="ms", utc=True)
+        keep = np.ones(len(fresh), dtype=bool)
+        with self.lock:
+            for (year, month), rows in fresh.groupby([dates.dt.year, dates.dt.month], sort=False).indices.items():
+                key = partition_key(year, month)
+                part = self._partition(key, tuple(manifest.get(key, ())))
+                part_rows = fresh.iloc[rows]
+                codes = part.codes(instrument_names(part_rows))
+                keys = composite_keys(codes, part_rows["date"].to_numpy())
+                keep[rows] = (codes < 0) | ~part.contains(keys)
+        fresh = fresh[keep]
+        dropped = len(df) - len(fresh)
+        if dropped:
+            self.duplicates[source] += dropped
+            log.info("%s: dropped %d duplicate readings", source, dropped)
+        return fresh
+
+    def add(self, df):
+        """Record rows just published by ``append_ctd``."""
+        manifest = read_manifest(self.root)
+        dates = pd.to_datetime(df["date"], unit="ms", utc=True)
+        with self.lock:
+            for (year, month), rows in df.groupby([dates.dt.year, dates.dt.month], sort=False).indices.items():
+                key = partition_key(year, month)
+                segments = tuple(manifest.get(key, ()))
+                part = self.partitions.get(key)
+                if part is None or part.segments != segments[:len(part.segments)] or len(segments) != len(part.segments) + 1:
+                    # Not the single append this index last saw: rebuild from the archive
+                    self.partitions.pop(key, None)
+                    self._partition(key, segments)
+                    continue
+                part_rows = df.iloc[rows]
+                keys = composite_keys(part.codes(instrument_names(part_rows), add=True), part_rows["date"].to_numpy())
+                part.keys = np.union1d(part.keys, keys)
+                part.segments = segments
+                self._save(key, part)
+
+    def append_new(self, df, source, append):
+        """Append the rows of a cleaned frame that are not archived yet; returns them.
+
+        ``append(rows, root)`` is e.g. ``append_ctd``. The manifest lock is
+        held from the check to the publish, so concurrent writers (threads
+        or processes) never both append the same reading.
+        """
+        with manifest_lock(self.root):
+            new = self.drop_seen(df, source)
+            if not new.empty:
+                append(new, self.root)
+                self.add(new)
+        return new
+
+    def report(self):
+        """{source: duplicates dropped} since this index was created."""
+        return dict(self.duplicates)
@@ -0,0 +1,125 @@
+"""Disk-backed LRU cache of DataFrames (Parquet files under ``.cache/eris/``) that survives server restarts."""
+import functools
+import hashlib
+import json
+import logging
+import os
+import threading
+
+import pandas as pd
+
+log = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(".cache", "eris")
+
+# Bump when the shape of cached frames changes so old entries are never read
+SCHEMA_VERSION = 1
+
+MAX_BYTES = 512 * 1024 * 1024
+
+
+class DiskCache:
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(namespace, version, args, kwargs):
+        payload = json.dumps([namespace, version, args, sorted(kwargs.items())], default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def path(self, key):
+        return os.path.join(self.root, key[:2], key + ".parquet")
+
+    def get(self, key):
+        path = self.path(key)
+        try:
+            df = pd.read_parquet(path)
+        except (FileNotFoundError, OSError, ValueError):
+            with self.lock:
+                self.misses += 1
+            return None
+        os.utime(path)
+        with self.lock:
+            self.hits += 1
+        return df
+
+    def put(self, key, df):
+        path = self.path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        df.to_parquet(tmp, index=False)
+        os.replace(tmp, path)
+        self.evict()
+
+    def entries(self):
+        """(mtime, size, path) for every entry, least recently used first."""
+        found = []
+        if not os.path.isdir(self.root):
+            return found
+        for sub in os.listdir(self.root):
+            folder = os.path.join(self.root, sub)
+            if not os.path.isdir(folder):
+                continue
+            for name in os.listdir(folder):
+                if name.endswith(".parquet"):
+                    path = os.path.join(folder, name)
+                    try:
+                        info = os.stat(path)
+                    except FileNotFoundError:
+                        continue
+                    found.append((info.st_mtime, info.st_size, path))
+        return sorted(found)
+
+    def evict(self):
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+    def stats(self):
+        entries = self.entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+        }
+
+
+default_cache = DiskCache()
+
+
+def disk_cached(namespace, version=SCHEMA_VERSION, cache=None):
+    """Cache a DataFrame-returning function on disk.
+
+    Results that depend on the archive should take its ``range_version`` as
+    an argument so new data invalidates only the entries it affects; stale
+    entries age out via LRU eviction. ``None`` results are not cached.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            store = cache or default_cache
+            key = store.make_key(namespace, version, list(args), kwargs)
+            df = store.get(key)
+            if df is not None:
+                return df
+            df = func(*args, **kwargs)
+            if isinstance(df, pd.DataFrame):
+                try:
+                    store.put(key, df)
+                except OSError as e:
+                    log.warning("Could not write disk cache entry for %s: %s", namespace, e)
+            return df
+        return wrapper
+    return decorator
@@ -0,0 +1,96 @@
+"""Shape-preserving downsampling for time-series charts.
+
+A decade of CTD readings is hundreds of thousands of points per series,
+far more than a chart a few thousand pixels wide can show. The functions
+here pick which samples to plot:
+
+* LTTB (Largest-Triangle-Three-Buckets) keeps the points that carry the
+  visual shape of the line, one per bucket.
+* min/max keeps the lowest and highest sample in each bucket, so spikes
+  are never dropped.
+
+Both return indices into the original arrays. Because the pages load only
+the selected date range and then reduce it to a fixed number of points, a
+narrower range automatically gets a higher time resolution.
+"""
+import numpy as np
+
+# Roughly two samples per horizontal pixel of a full-width chart
+DEFAULT_POINTS = 2000
+
+
+def as_float(x):
+    """Numeric view of an x axis (datetimes become int64 nanoseconds)."""
+    x = np.asarray(x)
+    if np.issubdtype(x.dtype, np.datetime64):
+        x = x.astype("datetime64[ns]").astype("int64")
+    return x.astype("float64")
+
+
+def bucket_edges(n_points, n_buckets):
+    """Start offsets of ``n_buckets`` equal-count buckets over ``n_points``."""
+    return np.linspace(0, n_points, n_buckets + 1).astype("int64")
+
+
+def lttb_indices(x, y, n_out):
+    """Indices of the ``n_out`` points LTTB selects (x, y without NaNs)."""
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    # First and last points are always kept; the rest is split into n_out - 2 buckets
+    edges = bucket_edges(n - 2, n_out - 2) + 1
+    selected = np.empty(n_out, dtype="int64")
+    selected[0] = 0
+    selected[-1] = n - 1
+    prev = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third triangle vertex
+        if i + 2 < len(edges):
+            nlo, nhi = edges[i + 1], edges[i + 2]
+            avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        else:
+            avg_x, avg_y = x[-1], y[-1]
+        area = np.abs(
+            (x[prev] - avg_x) * (y[lo:hi] - y[prev])
+            - (x[prev] - x[lo:hi]) * (avg_y - y[prev])
+        )
+        prev = lo + int(np.argmax(area))
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(x, y, n_out):
+    """Indices of the min and max sample in each of ``n_out // 2`` buckets."""
+    n = len(y)
+    n_buckets = max(n_out // 2, 1)
+    if n <= n_out:
+        return np.arange(n)
+    edges = bucket_edges(n, n_buckets)
+    bucket = np.repeat(np.arange(n_buckets), np.diff(edges))
+    # Sort by (bucket, y): the first/last element of each bucket run is its min/max
+    order = np.lexsort((y, bucket))
+    starts = edges[:-1]
+    ends = edges[1:] - 1
+    return np.unique(np.concatenate([order[starts], order[ends]]))
+
+
+METHODS = {"lttb": lttb_indices, "minmax": minmax_indices}
+
+
+def downsample(x, y, n_out=DEFAULT_POINTS, method="lttb", keep_gaps=True):
+    """Indices (sorted) of the samples to plot for one series.
+
+    NaN samples are ignored by the selection; with ``keep_gaps`` the first
+    NaN of every missing-data run is kept as well so lines still break
+    where the sensor had no reading.
+    """
+    y = np.asarray(y, dtype="float64")
+    valid = ~np.isnan(y)
+    idx = np.flatnonzero(valid)
+    if len(idx) > n_out:
+        idx = idx[METHODS[method](as_float(x)[idx], y[idx], n_out)]
+    if keep_gaps and not valid.all():
+        gap_starts = np.flatnonzero(~valid & np.concatenate([[True], valid[:-1]]))
+        idx = np.union1d(idx, gap_starts)
+    return idx
@@ -0,0 +1,127 @@
+"""Lazy, chunked file exports for the download buttons, cached per range until its data changes."""
+import gzip
+import hashlib
+import json
+import os
+import threading
+from collections import namedtuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from eris.archive import ARCHIVE_DIR, iter_ctd, range_version
+
+EXPORT_DIR = os.path.join(".cache", "eris", "exports")
+
+# Older export files beyond this count are deleted
+MAX_FILES = 20
+
+CHUNK_ROWS = 50_000
+
+Format = namedtuple("Format", ["label", "mime", "extension"])
+
+FORMATS = {
+    "csv": Format("CSV", "text/csv", "csv"),
+    "csv.gz": Format("CSV (gzip)", "application/gzip", "csv.gz"),
+    "parquet": Format("Parquet", "application/vnd.apache.parquet", "parquet"),
+}
+
+
+def export_name(stem, fmt):
+    return f"{stem}.{FORMATS[fmt].extension}"
+
+
+def arrow_table(df, schema=None):
+    """DataFrame -> Arrow table; all-empty text columns are typed as strings."""
+    table = pa.Table.from_pandas(df, schema=schema, preserve_index=False)
+    if schema is None:
+        fields = [f.with_type(pa.string()) if pa.types.is_null(f.type) else f for f in table.schema]
+        table = table.cast(pa.schema(fields).remove_metadata())
+    return table
+
+
+def write_chunks(chunks, path, fmt):
+    """Write an iterable of DataFrames to ``path`` one chunk at a time (atomic)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    if fmt == "parquet":
+        writer = None
+        try:
+            for chunk in chunks:
+                table = arrow_table(chunk, writer.schema if writer else None)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table)
+        finally:
+            if writer is not None:
+                writer.close()
+    else:
+        opener = gzip.open if fmt == "csv.gz" else open
+        with opener(tmp, "wt", newline="") as f:
+            for i, chunk in enumerate(chunks):
+                chunk.to_csv(f, index=False, header=i == 0)
+    os.replace(tmp, path)
+    return path
+
+
+def prune(export_dir=EXPORT_DIR, max_files=MAX_FILES):
+    if not os.path.isdir(export_dir):
+        return
+    paths = [os.path.join(export_dir, name) for name in os.listdir(export_dir) if not name.endswith(".tmp")]
+    paths.sort(key=os.path.getmtime)
+    for path in paths[:-max_files]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def as_export_frame(df, columns=None):
+    """Archive rows with ``date`` renamed to ``time``, in the order of ``columns``."""
+    df = df.rename(columns={"date": "time"})
+    if columns is None:
+        return df
+    return df[[c for c in columns if c in df.columns]]
+
+
+def archive_export(start, end, fmt, columns=None, root=ARCHIVE_DIR, export_dir=EXPORT_DIR):
+    """Path of an export of the archived CTD rows in ``[start, end)``.
+
+    ``date`` is written as a ``time`` column (pass ``"time"`` in ``columns``
+    to place it). The file is reused until a segment is added to or
+    compacted in one of the months the range covers (``range_version``).
+    """
+    key = json.dumps([str(start), str(end), fmt, columns, range_version(start, end, root)])
+    name = hashlib.sha256(key.encode()).hexdigest()[:32] + "." + FORMATS[fmt].extension
+    path = os.path.join(export_dir, name)
+    if os.path.exists(path):
+        os.utime(path)
+        return path
+    chunks = (as_export_frame(df, columns) for df in iter_ctd(start, end, columns, root))
+    write_chunks(chunks, path, fmt)
+    prune(export_dir)
+    return path
+
+
+def frame_export(df, fmt, export_dir=EXPORT_DIR, chunk_rows=CHUNK_ROWS):
+    """Path of a one-off export of an in-memory frame, written in ``chunk_rows`` slices."""
+    path = os.path.join(export_dir, f"frame-{os.getpid()}-{threading.get_ident()}.{FORMATS[fmt].extension}")
+    chunks = (df.iloc[i:i + chunk_rows] for i in range(0, max(len(df), 1), chunk_rows))
+    write_chunks(chunks, path, fmt)
+    return path
+
+
+def deferred(export, *args, remove=False, **kwargs):
+    """Zero-argument callable for ``st.download_button(data=...)``.
+
+    The export only runs when the button is clicked; the callable returns
+    the file's bytes (and deletes the file with ``remove``).
+    """
+    def data():
+        path = export(*args, **kwargs)
+        with open(path, "rb") as f:
+            content = f.read()
+        if remove:
+            os.remove(path)
+        return content
+    return data
@@ -0,0 +1,23 @@
+"""The process-wide Firestore client, created on first use."""
+import json
+import os
+
+import streamlit as st
+
+SERVICE_ACCOUNT_FILE = "service_account.json"
+
+
+def load_certificate():
+    if os.path.exists(SERVICE_ACCOUNT_FILE):
+        return SERVICE_ACCOUNT_FILE
+    return json.loads(st.secrets["Certificate"]["data"])
+
+
+@st.cache_resource(show_spinner=False)
+def get_db():
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    if not firebase_admin._apps:
+        firebase_admin.initialize_app(credentials.Certificate(load_certificate()))
+    return firestore.client()
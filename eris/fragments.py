@@ -0,0 +1,31 @@
+"""Per-process cache of the HTML built for the static pages, rebuilt when a source file changes."""
+import functools
+import os
+import threading
+
+from eris.assets import file_version
+
+_cache = {}
+_lock = threading.Lock()
+
+
+def static_fragment(*sources):
+    def decorator(func):
+        name = (func.__module__, func.__qualname__)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+            paths = list(sources) + [a for a in (*args, *kwargs.values()) if isinstance(a, str) and os.path.isfile(a)]
+            versions = tuple(file_version(p) for p in paths)
+            with _lock:
+                hit = _cache.get(key)
+            if hit is not None and hit[0] == versions:
+                return hit[1]
+            html = func(*args, **kwargs)
+            with _lock:
+                _cache[key] = (versions, html)
+            return html
+
+        return wrapper
+    return decorator
@@ -0,0 +1,43 @@
+"""Photo list for the Gallery page, read from ``images/gallery.json``.
+
+The index is a JSON list of ``{"file": ..., "caption": ...}`` entries in
+display order, with ``file`` relative to ``images/``. Adding a photo means
+dropping it into ``images/`` and adding a line to the index. No code
+change is needed.
+"""
+import functools
+import json
+import logging
+import os
+
+from eris.assets import IMAGE_DIR, file_version
+
+log = logging.getLogger(__name__)
+
+GALLERY_INDEX = os.path.join(IMAGE_DIR, "gallery.json")
+
+# Photos rendered per batch; the first row is loaded eagerly, the rest lazily
+BATCH_SIZE = 9
+EAGER_COUNT = 3
+
+
+@functools.lru_cache(maxsize=4)
+def _load_index(index_path, version):
+    with open(index_path) as f:
+        entries = json.load(f)
+    photos = []
+    for entry in entries:
+        path = os.path.join(os.path.dirname(index_path), entry["file"])
+        if os.path.exists(path):
+            photos.append((path, entry.get("caption", "")))
+        else:
+            log.warning("Gallery photo listed in %s is missing: %s", index_path, path)
+    return tuple(photos)
+
+
+def load_index(index_path=GALLERY_INDEX):
+    """(path, caption) for every listed photo that exists; re-read when the index changes."""
+    version = file_version(index_path)
+    if version is None:
+        return ()
+    return _load_index(index_path, version)
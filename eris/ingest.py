@@ -0,0 +1,211 @@
+"""Shared Firestore ingest: collection schemas, one query engine, sinks.
+
+Every path that reads Firestore (the Streamlit pages, ERISAppendCode.py,
+the sync) goes through ``run``::
+
+    frame = run(db, CTD, FrameSink(), start=day_start, end=day_end)
+    run(db, CTD, ArchiveSink(), start=watermark_ms + 1)
+
+``run`` issues a server-side range query on the schema's time field,
+ordered by time and fetched page by page, decodes each page column-wise
+(see eris/decode.py) and hands the frames to the sink. Each page request
+is bounded and retried by ``eris.retry.firestore_call``.
+"""
+import logging
+from collections import namedtuple
+
+import pandas as pd
+from google.cloud.firestore_v1.base_query import FieldFilter
+
+from eris.archive import (
+    ARCHIVE_DIR,
+    append_ctd,
+    append_weather,
+    clean_ctd_frame,
+    clean_weather_frame,
+    raise_watermark,
+    to_epoch_ms,
+)
+from eris.decode import decode_documents
+from eris.dedup import index_for
+from eris.retry import firestore_call
+
+log = logging.getLogger(__name__)
+
+PAGE_SIZE = 1000
+
+# The Pi buffers readings while offline and uploads them later with their
+# original timestamps. Polls only ask for documents past the watermark; every
+# LOOKBACK_INTERVAL seconds a sync re-reads the last LOOKBACK_MS as well.
+# Uploads later than that need ``python -m eris.backfill``.
+LOOKBACK_MS = 24 * 3600 * 1000
+LOOKBACK_INTERVAL = 3600
+
+# collection: Firestore collection name
+# time_field: dotted path of the document timestamp ("date.$date")
+# time_column: name of the decoded time column
+# time_unit: "ms" for epoch-millisecond numbers, None for Firestore Timestamps
+# numeric / text: fields copied into float64 / string columns
+Schema = namedtuple("Schema", ["collection", "time_field", "time_column", "time_unit", "numeric", "text"])
+
+CTD = Schema(
+    collection="CTD_Data",
+    time_field="date.$date",
+    time_column="date",
+    time_unit="ms",
+    numeric=["lat", "lon", "depth1", "oxygen", "conductivity", "par", "pressure", "salinity", "temperature", "turbidity"],
+    text=["instrument"],
+)
+
+WEATHER = Schema(
+    collection="Weather_Data",
+    time_field="timestamp",
+    time_column="datetime",
+    time_unit=None,
+    numeric=[
+        "temp_out", "temp_hi", "temp_low", "out_hum", "dew_pt", "wind_speed", "bar",
+        "rain", "rain_rate", "heat_index", "wind_chill", "in_temp", "in_hum",
+    ],
+    text=["wind_dir"],
+)
+
+
+def field_path(path):
+    """Firestore field path for a dotted path, backtick-quoting odd names like ``$date``."""
+    parts = []
+    for part in path.split("."):
+        if not part.replace("_", "a").isalnum() or part[0].isdigit():
+            part = f"`{part}`"
+        parts.append(part)
+    return ".".join(parts)
+
+
+def time_value(schema, value):
+    """Convert a date/datetime/string bound to what the time field stores."""
+    if schema.time_unit == "ms":
+        return value if isinstance(value, int) else to_epoch_ms(value)
+    # Integers are epoch-ms (archive watermarks)
+    ts = pd.Timestamp(value, unit="ms") if isinstance(value, int) else pd.Timestamp(value)
+    if ts.tzinfo is None:
+        ts = ts.tz_localize("UTC")
+    return ts.to_pydatetime()
+
+
+def build_query(db, schema, start=None, end=None, descending=False):
+    """Range query ``start <= time < end`` ordered by time."""
+    path = field_path(schema.time_field)
+    query = db.collection(schema.collection)
+    if start is not None:
+        query = query.where(filter=FieldFilter(path, ">=", time_value(schema, start)))
+    if end is not None:
+        query = query.where(filter=FieldFilter(path, "<", time_value(schema, end)))
+    return query.order_by(path, direction="DESCENDING" if descending else "ASCENDING")
+
+
+def fetch_page(query):
+    return list(query.stream())
+
+
+def pages(db, schema, start=None, end=None, limit=None, descending=False, page_size=PAGE_SIZE):
+    """Yield lists of document snapshots, at most ``limit`` documents in total."""
+    query = build_query(db, schema, start, end, descending)
+    fetched = 0
+    last_snapshot = None
+    while limit is None or fetched < limit:
+        size = page_size if limit is None else min(page_size, limit - fetched)
+        page_query = query.limit(size)
+        if last_snapshot is not None:
+            page_query = page_query.start_after(last_snapshot)
+        snapshots = firestore_call(fetch_page, page_query)
+        if not snapshots:
+            return
+        yield snapshots
+        fetched += len(snapshots)
+        last_snapshot = snapshots[-1]
+        if len(snapshots) < size:
+            return
+
+
+def decode(snapshots, schema):
+    return decode_documents(
+        snapshots, schema.time_field, schema.time_column, schema.numeric, schema.text, schema.time_unit
+    )
+
+
+def empty_frame(schema):
+    frame = pd.DataFrame({schema.time_column: pd.Series(dtype="datetime64[ns, UTC]")})
+    for name in schema.numeric:
+        frame[name] = pd.Series(dtype="float64")
+    for name in schema.text:
+        frame[name] = pd.Series(dtype="string")
+    return frame
+
+
+def run(db, schema, sink, start=None, end=None, limit=None, descending=False, page_size=PAGE_SIZE):
+    """Stream a range of ``schema.collection`` into ``sink`` and return ``sink.result()``."""
+    rejected = 0
+    for snapshots in pages(db, schema, start, end, limit, descending, page_size):
+        decoded = decode(snapshots, schema)
+        rejected += len(decoded.rejected)
+        sink.write(decoded.frame, schema)
+    if rejected:
+        log.warning("%s: %d documents rejected during ingest", schema.collection, rejected)
+    return sink.result(schema)
+
+
+class FrameSink:
+    """Collect everything into one DataFrame sorted by time."""
+
+    def __init__(self):
+        self.frames = []
+
+    def write(self, frame, schema):
+        if not frame.empty:
+            self.frames.append(frame)
+
+    def result(self, schema):
+        if not self.frames:
+            return empty_frame(schema)
+        return pd.concat(self.frames, ignore_index=True).sort_values(schema.time_column, kind="stable").reset_index(drop=True)
+
+
+# Collections kept in a Parquet archive: collection -> (clean, append)
+ARCHIVED = {
+    CTD.collection: (clean_ctd_frame, append_ctd),
+    WEATHER.collection: (clean_weather_frame, append_weather),
+}
+
+
+class ArchiveSink(FrameSink):
+    """Append each page to a Parquet archive and advance its watermark.
+
+    Readings already archived are dropped first (see eris/dedup.py). The
+    result is the new rows as stored (cleaned, ``date`` in epoch-ms).
+    Backfills of older ranges pass ``advance_watermark=False``.
+    """
+
+    def __init__(self, root=ARCHIVE_DIR, source=None, advance_watermark=True):
+        super().__init__()
+        self.root = root
+        self.source = source
+        self.advance_watermark = advance_watermark
+        self.dedup = index_for(root)
+
+    def write(self, frame, schema):
+        if schema.collection not in ARCHIVED:
+            raise ValueError(f"No archive stores {schema.collection}")
+        clean, append = ARCHIVED[schema.collection]
+        page = clean(frame)
+        if page.empty:
+            return
+        fresh = self.dedup.append_new(page, self.source or schema.collection, append)
+        if not fresh.empty:
+            self.frames.append(fresh)
+        if self.advance_watermark:
+            # Pages re-read behind the watermark (a lookback) must not move it back
+            raise_watermark(page["date"].max(), self.root, schema.collection)
+
+    def result(self, schema):
+        if not self.frames:
+            return ARCHIVED[schema.collection][0](pd.DataFrame())
+        return pd.concat(self.frames, ignore_index=True)
@@ -0,0 +1,22 @@
+"""One module per sidebar page, each with a ``render()`` function.
+
+A page module is imported the first time its page is shown, so plotly,
+folium, pyarrow and the Firestore client are only loaded by the pages that
+use them. The static pages start without any of them.
+"""
+import importlib
+
+# Sidebar title -> module in this package
+PAGES = {
+    "Main Page": "home",
+    "Live CTD Data (2025 to Present)": "live",
+    "CTD Data (2015 to 2024)": "history",
+    "Weather Station History": "weather",
+    "What is our Instrument?": "instrument",
+    "Meet the Team": "team",
+    "Gallery": "gallery",
+}
+
+
+def render(title):
+    importlib.import_module(f"{__name__}.{PAGES[title]}").render()
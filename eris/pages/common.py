@@ -0,0 +1,37 @@
+"""Pieces shared by several pages."""
+import streamlit as st
+
+from eris.assets import image_src
+from eris.fragments import static_fragment
+
+LOGO_PATH = "images/OceanTech Logo-PURPLE.png"
+SIDEBAR_LOGO_PATH = "images/New Oceanography-logo-banner-BLUE.png"
+
+
+# Title with logos on both sides, built once per process
+@static_fragment(LOGO_PATH)
+def page_header_html(title):
+    logo_src = image_src(LOGO_PATH)
+    logo_html = f"<img src='{logo_src}' style='width:150px; height:auto;'>" if logo_src else "⚠️ Logo Not Found"
+    return f"""
+        <div style="display: flex; align-items: center; justify-content: center; gap: 20px;">
+            {logo_html}
+            <h1 style='text-align: center; font-family:Georgia, serif; margin:0;'>{title}</h1>
+            {logo_html}
+        </div>
+        """
+
+
+@static_fragment(SIDEBAR_LOGO_PATH)
+def sidebar_logo_html():
+    # Full-width banner at the top of the sidebar (styled by .sidebar-logo-container)
+    return f'<div class="sidebar-logo-container"><img src="{image_src(SIDEBAR_LOGO_PATH)}"></div>'
+
+
+def show_disk_cache_stats():
+    """Disk cache counters (per server process) in the sidebar."""
+    # Imported here so the static pages never load pandas
+    from eris.diskcache import default_cache
+
+    cache_stats = default_cache.stats()
+    st.sidebar.caption(f"Disk cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, {cache_stats['entries']} files")
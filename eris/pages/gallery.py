@@ -0,0 +1,54 @@
+"""Gallery: photos listed in images/gallery.json."""
+import streamlit as st
+
+from eris.fragments import static_fragment
+from eris.gallery import BATCH_SIZE, EAGER_COUNT, load_index
+from eris.pages.common import page_header_html
+from eris.thumbnails import responsive_img
+
+
+@static_fragment()
+def gallery_card_html(photo, caption, lazy=False):
+    # ✅ Resized WebP/JPEG versions; the browser picks the width it needs for a 1/3 column
+    picture = responsive_img(photo, sizes="(max-width: 640px) 100vw, 33vw", alt=caption,
+                             style="width:100%; border-radius:15px;", lazy=lazy)
+    if not picture:
+        return None
+    # ✅ Uniform square image container with consistent formatting
+    return f"""
+        <div style="text-align:center; margin-bottom:20px;">
+            {picture}
+            <p style="font-size:16px; font-weight:bold; margin-top:10px;">{caption}</p>
+        </div>
+        """
+
+
+def render():
+
+    # Title with Logos on Both Sides (built once per process)
+    st.markdown(page_header_html("Gallery"), unsafe_allow_html=True)
+
+    # ✅ Photos and captions come from images/gallery.json
+    valid_gallery = load_index()
+
+    if not valid_gallery:
+        st.error("⚠️ No valid images found for the gallery. Check images/gallery.json.")
+    else:
+        # ✅ Render one batch at a time; photos below the first row load lazily
+        if "gallery_shown" not in st.session_state:
+            st.session_state.gallery_shown = BATCH_SIZE
+        shown = valid_gallery[:st.session_state.gallery_shown]
+
+        col1, col2, col3 = st.columns(3)
+        columns = [col1, col2, col3]
+
+        for i, (photo, caption) in enumerate(shown):
+            img_html = gallery_card_html(photo, caption, lazy=i >= EAGER_COUNT)
+            if img_html:
+                with columns[i % 3]:  # Distribute images evenly
+                    st.markdown(img_html, unsafe_allow_html=True)
+
+        if len(shown) < len(valid_gallery):
+            if st.button(f"Show more photos ({len(valid_gallery) - len(shown)} more)"):
+                st.session_state.gallery_shown += BATCH_SIZE
+                st.rerun()
@@ -0,0 +1,165 @@
+"""CTD Data (2015 to 2024): the historical Parquet archive."""
+import pandas as pd
+import plotly.graph_objs as go
+import streamlit as st
+
+from eris.archive import ARCHIVE_DIR, archive_bounds, load_ctd, range_version
+from eris.charts import add_series
+from eris.diskcache import disk_cached
+from eris.downsample import DEFAULT_POINTS
+from eris.export import FORMATS, archive_export, deferred, export_name
+from eris.pages.common import page_header_html, show_disk_cache_stats
+from eris.rollup import LABELS, choose_resolution, load_rollup, max_gap, mean_frame, rollup_version
+from eris.table import paginated_table
+from eris.worker import ingest_worker
+
+
+# Historical CTD data lives in the Parquet archive built by eris/archive.py;
+# ``segments`` (see ``range_version``) changes when rows are added to the range
+@st.cache_data(ttl=3600, max_entries=16)
+@disk_cached("ctd_range")
+def load_ctd_range(start, end, segments, columns=None):
+    return load_ctd(start, end, columns)
+
+
+@st.cache_data(ttl=600)
+def ctd_archive_bounds():
+    return archive_bounds()
+
+
+# Hourly/daily/monthly means for long ranges (built by eris/rollup.py)
+# ``files`` (see ``rollup_version``) changes when a sync rewrites one of the months
+@st.cache_data(ttl=3600, max_entries=16)
+def load_rollup_range(resolution, start, end, files):
+    return mean_frame(load_rollup(resolution, start, end))
+
+
+def load_range_or_stop(start, end):
+    """Raw rows of the range with ``date`` renamed to ``time``; stops the page on a read error."""
+    try:
+        df = load_ctd_range(start, end, range_version(start, end))
+    except Exception as e:
+        st.error(f"Failed to load CTD data: {e}")
+        st.stop()
+    return df.rename(columns={'date': 'time'})
+
+
+def render():
+    # ✅ The first data page visited starts the Firestore poller that keeps the archive current
+    ingest_worker()
+    show_disk_cache_stats()
+
+    # Title with Logos on Both Sides (built once per process)
+    st.markdown(page_header_html("UW ERIS CTD Data"), unsafe_allow_html=True)
+
+    # ✅ Archive extent comes from Parquet footers, no rows are read here
+    first_time, last_time = ctd_archive_bounds()
+    if last_time is None:
+        st.error(f"No archived CTD data found in {ARCHIVE_DIR}. Run: python -m eris.archive ERIS_data_2015-2024.csv")
+        st.stop()
+
+    # ✅ Date range filtering UI
+    st.write("### Date Range Selection")
+    fixed_start = pd.to_datetime("2015-12-22 19:38:34+00:00")
+
+    # Ensure timezone-aware
+    start_date = st.date_input("Start Date", value=fixed_start.date())
+    start_date = pd.to_datetime(start_date).tz_localize('UTC')
+
+    end_date = st.date_input("End Date", value=last_time.date())
+    end_date = pd.to_datetime(end_date).tz_localize('UTC')
+
+    range_end = end_date + pd.Timedelta(days=1)
+
+    # ✅ Plotting (each series is downsampled to a screen-sized number of points
+    # unless every sample is requested; large traces then switch to WebGL)
+    full_resolution = st.checkbox("Show every sample (slower for long ranges)", value=False)
+    max_points = None if full_resolution else DEFAULT_POINTS
+
+    # ✅ Long ranges are drawn from the pre-aggregated rollups instead of raw samples;
+    # their raw rows are only loaded when the table is asked for
+    resolution = "raw" if full_resolution else choose_resolution(start_date, range_end)
+    filtered_ctd_data = None
+    chart_data = load_rollup_range(resolution, start_date, range_end, rollup_version(resolution, start_date, range_end)) if resolution != "raw" else None
+    if chart_data is not None and not chart_data.empty:
+        chart_data, chart_gap = chart_data.rename(columns={'date': 'time'}), max_gap(resolution)
+        st.caption(f"{LABELS[resolution]} means ({len(chart_data):,} points) for this range.")
+    else:
+        filtered_ctd_data = load_range_or_stop(start_date, range_end)
+        chart_data, chart_gap = filtered_ctd_data, None
+
+    fig1 = go.Figure()
+    add_series(fig1, chart_data, 'time', 'temperature', 'Temperature (°C)', 'red', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'salinity', 'Salinity (PSU)', 'blue', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'par', 'PAR (μmol/m² s)', 'purple', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'conductivity', 'Conductivity (S/m)', 'yellow', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'oxygen', 'Oxygen (mL/L)', 'green', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'turbidity', 'Turbidity (mg/L)', 'gold', max_points=max_points, max_gap=chart_gap)
+    add_series(fig1, chart_data, 'time', 'pressure', 'Pressure (dbar)', 'black', max_points=max_points, max_gap=chart_gap)
+
+    fig1.update_layout(
+        #title="UW ERIS CTD MEASUREMENTS",
+        xaxis_title="Time",
+        yaxis_title="Values",
+        width=1000,
+        height=500,
+        xaxis=dict(
+            rangeslider=dict(visible=True),
+            type="date",
+            rangeselector=dict(
+                buttons=[
+                    dict(count=1, label="1d", step="day", stepmode="backward"),
+                    dict(count=7, label="1w", step="day", stepmode="backward"),
+                    dict(count=1, label="1m", step="month", stepmode="backward"),
+                    dict(count=6, label="6m", step="month", stepmode="backward"),
+                    dict(step="all")
+                ],
+                x=0.5, y=1.15, xanchor='center', yanchor='bottom',
+                bgcolor="#444",
+                font=dict(color="#FFF"),
+                activecolor="#74bcf7"
+            )
+        ),
+        yaxis=dict(
+            showgrid=True,
+            gridcolor='lightgrey'
+        ),
+        plot_bgcolor="white",
+        paper_bgcolor="lightblue",
+        font=dict(family="Georgia, serif", size=12, color="black"),
+        legend=dict(
+            x=1.05,
+            y=0.5,
+            xanchor='left',
+            yanchor='middle',
+            traceorder="normal",
+            bgcolor='rgba(255, 255, 255, 0.5)'
+        ),
+        margin=dict(l=80, r=80, t=50, b=80),
+        autosize=False
+    )
+
+    st.plotly_chart(fig1, use_container_width=True)
+
+    # ✅ Table & download (only the button and data table)
+    columns_to_display = ['time', 'instrument', 'lat', 'lon', 'depth1', 'oxygen', 'conductivity', 'par', 'pressure', 'salinity', 'temperature', 'turbidity']
+
+    if chart_data.empty:
+        st.warning("No filtered CTD data available.")
+        return
+
+    # Download button: the file is written from the archive month by month, only on click
+    export_format = st.radio("Download format", list(FORMATS), format_func=lambda f: FORMATS[f].label, horizontal=True)
+    st.download_button(
+        "Download CTD Data",
+        deferred(archive_export, start_date, range_end, export_format, columns_to_display),
+        export_name("ctd_data", export_format),
+        mime=FORMATS[export_format].mime,
+    )
+
+    if filtered_ctd_data is None and st.checkbox("Show individual readings (loads every row in the range)", value=False):
+        filtered_ctd_data = load_range_or_stop(start_date, range_end)
+
+    # Show table (one page at a time, sorted/filtered on the server)
+    if filtered_ctd_data is not None:
+        paginated_table(filtered_ctd_data[columns_to_display], key="ctd_history")
@@ -0,0 +1,139 @@
+"""Main Page: welcome banner and course information."""
+import os
+
+import streamlit as st
+
+from eris.assets import image_src
+from eris.fragments import static_fragment
+from eris.thumbnails import responsive_img
+
+
+@static_fragment()
+def main_banner_html(main_image_path, caption, left_logo_path, right_logo_path):
+    main_src = image_src(main_image_path)
+    left_logo = image_src(left_logo_path)
+    right_logo = image_src(right_logo_path)
+    return f"""
+        <style>
+        .static-image-container {{
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            width: 100%;
+        }}
+        .logo {{
+            width: 250px;
+            height: auto;
+            margin: 0 20px;
+        }}
+        .main-image {{
+            max-width: 60%;
+            height: auto;
+            max-height: 500px;
+            border-radius: 15px;
+            box-shadow: 0 4px 8px rgba(0,0,0,0.2);
+        }}
+        .caption {{
+            text-align: center;
+            font-size: 18px;
+            font-weight: bold;
+            margin-top: 10px;
+        }}
+        </style>
+        <div class="static-image-container">
+            {'<img src="' + left_logo + '" class="logo">' if left_logo else ''}
+            <img src="{main_src}" class="main-image">
+            {'<img src="' + right_logo + '" class="logo">' if right_logo else ''}
+        </div>
+        <p class="caption">{caption}</p>
+        """
+
+
+@static_fragment()
+def photo_html(path):
+    # Half-width column photo (replaces st.image, which re-read the file every rerun)
+    return responsive_img(path, sizes="(max-width: 640px) 100vw, 50vw", style="width:100%;")
+
+
+def render():
+    st.markdown("<h1 style='text-align: center; font-family:Georgia, serif;'>Welcome to ERIS</h1>", unsafe_allow_html=True)
+
+    main_image_path = "images/grads.jpg"
+    caption = "2024 Graduating Marine Technicians"
+    left_logo_path = "images/OceanTech Logo-PURPLE.png"
+    right_logo_path = "images/OceanTech Logo-PURPLE.png"
+
+    if os.path.exists(main_image_path):
+        st.markdown(main_banner_html(main_image_path, caption, left_logo_path, right_logo_path), unsafe_allow_html=True)
+    else:
+        st.error("⚠️ Static image not found. Please check the file path.")
+
+    # 📹 Navigation Tutorial Button
+    st.markdown(
+        """
+        <style>
+            .full-width-link {
+                display: block;
+                width: 100%;
+                background-color: #74bcf7;
+                color: black !important;
+                text-align: center;
+                padding: 15px;
+                font-size: 20px;
+                font-weight: bold;
+                text-decoration: none;
+                border-radius: 5px;
+            }
+            .full-width-link:hover {
+                background-color: #5A0C9D;
+                color: white !important;
+            }
+        </style>
+        <a href="https://youtu.be/zQ8caaUxIvY?si=NlzA_W-o2h0XHfeM" class="full-width-link" target="_blank">Navigation Tutorial</a>
+        """,
+        unsafe_allow_html=True
+    )
+
+
+    #🔬 Educational Content
+    st.write("### What is ERIS?")
+    st.write("ERIS (Exploration and Remote Instrumentation by Students) is a student designed and built cabled observatory that serves as an underwater learning facility at the [University of Washington (UW)](https://www.washington.edu/). Students work with ERIS through Ocean 462. ERIS, with its educational mission, enables undergraduate students to design, build, operate, and maintain a cabled underwater observatory that emulates the NSF Ocean Observatories Initiatives (OOI) Regional Cabled Array, by providing for a continuous data-stream for analysis, interpretation, and communication by students. From inspiration through implementation, this program is focused on the creation and operation of an underwater science sensor network that is physically located off the dock of the [UW School of Oceanography](https://www.ocean.washington.edu/) at UW Seattle Campus.")
+
+    col1, col2 = st.columns([1, 1])
+
+    with col1:
+        st.write("### Key Science Questions")
+        st.write("-  How do anthropogenic processes mediate natural processes in the marine environment?")
+        st.write("-  What are the temporal and spatial scales over which anthropogenic activities occur?")
+        st.write("-  How does the temperature, light, chemistry, and velocity of the marine environment change temporally and spatially?")
+        st.write("-  What unique ecological systems are present?")
+        st.write("-  What is the composition, configuration, and concentration of organisms in the different ecological systems?")
+        st.write("-  How are these systems impacted by both natural and anthropogenic events?")
+        st.write(" ")
+        st.write("ERIS will also encourage students to explore a range of technical considerations.")
+
+    with col2:
+        st.markdown(photo_html("images/tub.jpg"), unsafe_allow_html=True)
+
+    col3, col4 = st.columns([1, 1])
+
+    with col3:
+        st.markdown("<!-- This is an invisible comment -->", unsafe_allow_html=True)
+        st.markdown(photo_html("images/ctdmaintenence.jpg"), unsafe_allow_html=True)
+
+    with col4:
+        st.write("### Technology Questions:")
+        st.write("-  What sensor(s) design is required?")
+        st.write("-  What sample rate and duty cycle is needed?")
+        st.write("-  What measurement accuracy is need and what can be achieved?")
+        st.write("-  How should remote observations be made?")
+        st.write("-  How can sensors be deployed and serviced?")
+        st.write("-  What are the power requirements?")
+        st.write("-  How will data be delivered, stored, and accessed?")
+        st.write("-  How will data be analyzed, interpreted, visualized, and communicated?")
+        st.write(" ")
+        st.write("As the observatory is being implemented, students focus on maintaining the components, as well as collecting, managing, and analyzing the continuous streams of data the observatory will produce. Integral to the ERIS program is the ability to distribute the collected data so that it may be interpreted by interested parties at the UW and worldwide.")
+
+    st.write("### Course: OCEAN 462: Ocean Technology Studio")
+    st.write("Hands-on experience to build technical, science, and management skills in ocean technology through small group projects. Projects may include instrument design and building, data analysis, and/or participation in an on-going ocean technology initiative. Offered: AWSp. Can be taken for 1-5 credits, with a max of 15.")
+    st.write("For more information, visit [MyPlan](https://myplan.uw.edu/course/#/courses?states=N4Igwg9grgTgzgUwMoIIYwMYAsQC4TAA6IAZhDALYAiqALqsbkSBqhQA5RyPGJ20AbBMQA0xAJZwUGWuIgA7FOmyNaMKAjEhJASXlw1UGeSWYsjEqgGItARw0wAnkjXj5Acx4hRxACapHbjxmAEYLKxtiACZw601iAGZYyJAAFmT4kABWDK0ANgyAXy0DdFoAUXlfABVxCgQg3ABtAAYRAE48loBdLTcMAShfBAA5BQB5dgRFBBk5fVV1TP7B4YAlBtcZBF9pWQVGw2X5AaGEAAUYBCvbOA37cSvfRY0%2Bk9WEaoAjVD35w6WJSwEAA7uN5AJHOcMMhZvsFnhLHEgaDwZC9OdrnAFH8DkUUSCAEIwUGIXLELCoKRoMw7ckgXySAYQRAAQV8ADdUCcdqYVIiIghCiBCkA).")
@@ -0,0 +1,191 @@
+"""Live CTD Data: recent readings from Firestore plus today's weather.
+
+The data comes from the caches kept up to date by the background
+ingestion worker (``eris.worker``); a render never waits on Firestore.
+When Firestore is unreachable the page keeps showing the last good data
+with a warning saying how old it is.
+"""
+from datetime import date
+
+import folium
+import pandas as pd
+import plotly.graph_objs as go
+import streamlit as st
+from streamlit_folium import folium_static
+
+from eris.charts import CTD_MAX_GAP, add_series
+from eris.export import deferred, frame_export
+from eris.pages.common import page_header_html, show_disk_cache_stats
+from eris.table import paginated_table
+from eris.worker import POLL_INTERVAL, ingest_worker
+
+
+def as_live_frame(df):
+    # Archive rows -> the shape the live page plots (naive "datetime" column)
+    df = df.rename(columns={"date": "datetime"})
+    df["datetime"] = df["datetime"].dt.tz_convert(None)
+    return df
+
+
+def fetch_ctd_data(ctd, start, end):
+    df = as_live_frame(ctd.frame(start, end))
+    return df if not df.empty else None
+
+
+def format_utc(ts):
+    return ts.strftime("%Y-%m-%d %H:%M:%S") + " UTC" if ts is not None else "never"
+
+
+def render():
+    show_disk_cache_stats()
+
+    worker = ingest_worker()
+    with st.spinner("Loading CTD data..."):
+        ctd = worker.source("ctd")
+        weather = worker.source("weather")
+    if ctd is None:
+        st.error(f"Live data is unavailable: {worker.error}")
+        return
+
+    st.markdown(page_header_html("UW ERIS CTD DATA"), unsafe_allow_html=True)
+
+    st.subheader("Date Range Selection")
+    # ✅ Defaults to the days held in memory; earlier starts also read the archive
+    start = st.date_input("Start Date", ctd.cold_start.date())
+    end = st.date_input("End Date", date.today(), min_value=start)
+
+    if end < start:
+        st.error("End Date must be on or after Start Date.")
+        return
+
+    start_dt = pd.Timestamp(start)
+    end_dt = pd.Timestamp(end) + pd.Timedelta(days=1) - pd.Timedelta(seconds=1)
+
+    data = fetch_ctd_data(ctd, start_dt, end_dt + pd.Timedelta(seconds=1))
+
+    if data is None or data.empty:
+        st.warning("No CTD data found.")
+        return
+
+    if ctd.stale:
+        st.warning(f"⚠️ Firestore is unreachable right now; showing data last synced {format_utc(ctd.synced_at)}.")
+    if ctd.synced_at is None and not ctd.stale:
+        st.caption("Syncing with Firestore in the background...")
+    else:
+        st.caption(f"Last updated: {format_utc(ctd.synced_at)}")
+
+    filtered_data = data[(data["datetime"] >= start_dt) & (data["datetime"] <= end_dt)]
+
+    if filtered_data.empty:
+        st.warning("No CTD data for the selected date range.")
+        return
+
+    # One trace per variable; missing readings and pauses > CTD_MAX_GAP break the line
+    fig = go.Figure()
+    add_series(fig, filtered_data, "datetime", "temperature", "Temperature (°C)", "red", max_gap=CTD_MAX_GAP)
+    add_series(fig, filtered_data, "datetime", "salinity", "Salinity (PSU)", "blue", max_gap=CTD_MAX_GAP)
+    add_series(fig, filtered_data, "datetime", "par", "PAR (μmol/m² s)", "purple", max_gap=CTD_MAX_GAP)
+    add_series(fig, filtered_data, "datetime", "conductivity", "Conductivity (S/m)", "yellow", max_gap=CTD_MAX_GAP)
+    add_series(fig, filtered_data, "datetime", "oxygen", "Oxygen (mL/L)", "green", max_gap=CTD_MAX_GAP)
+    add_series(fig, filtered_data, "datetime", "turbidity", "Turbidity (mg/L)", "gold", max_gap=CTD_MAX_GAP)
+    add_series(fig, filtered_data, "datetime", "pressure", "Pressure (dbar)", "black", max_gap=CTD_MAX_GAP)
+
+    fig.update_layout(
+        xaxis_title="Time",
+        yaxis_title="Values",
+        height=450,
+        xaxis=dict(
+            rangeslider=dict(visible=True),
+            type="date",
+            rangeselector=dict(
+                buttons=[
+                    dict(count=1, label="1d", step="day", stepmode="backward"),
+                    dict(count=7, label="1w", step="day", stepmode="backward"),
+                    dict(count=1, label="1m", step="month", stepmode="backward"),
+                    dict(count=6, label="6m", step="month", stepmode="backward"),
+                    dict(step="all")
+                ],
+                x=0.5, y=1.15, xanchor='center', yanchor='bottom', bgcolor ="#444", font=dict(color="#FFF"), activecolor="#74bcf7"
+            )
+        ),
+        yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+        plot_bgcolor="white",
+        paper_bgcolor="lightblue",
+        font=dict(family="Georgia, serif", size=12, color="black"),
+        legend=dict(x=1.05, y=0.5, xanchor='left', yanchor='middle', bgcolor='rgba(255, 255, 255, 0.5)'),
+        margin=dict(l=80, r=80, t=50, b=80),
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ✅ The CSV is only built when the button is clicked
+    st.download_button("Download CTD Data", deferred(frame_export, filtered_data, "csv", remove=True), "ctd_data.csv", mime="text/csv")
+
+    paginated_table(filtered_data, key="ctd_live")
+
+    st.write(f"NOTE: New readings from our deployed CTD are fetched in the background every {POLL_INTERVAL} seconds; rerun the page to see them. Disregard all oxygen values, they are in the process of being fixed.")
+    st.write("### Instrument Location")
+    map_center = [47.64935, -122.3127]
+    m = folium.Map(location=map_center, zoom_start=15, width='100%', height='600px')
+
+    folium.Marker(
+        location=map_center,
+        tooltip="CTD: 47.64935, -122.3127",
+        icon=folium.Icon(icon='star', prefix='fa', color='orange')
+    ).add_to(m)
+
+    folium_static(m, width=1500, height=500)
+
+    # --- Weather Station Section ---
+    st.write("---")
+    st.subheader("🌤️ Weather Station Data (Today)")
+
+    weather_df = weather.today_frame()
+
+    if weather.stale:
+        st.warning(f"⚠️ Firestore is unreachable right now; weather data is from {format_utc(weather.synced_at)}.")
+
+    if weather_df is None or weather_df.empty:
+        st.warning("No weather data available for today.")
+    else:
+        weather_filtered = weather_df[
+            (weather_df["datetime"] >= start_dt) & (weather_df["datetime"] <= end_dt)
+        ]
+
+        if weather_filtered.empty:
+            st.warning("No weather data for the selected date range.")
+        else:
+            fig_weather = go.Figure()
+            add_series(fig_weather, weather_filtered, "datetime", "temp_out", 'Temp Out (°C)', 'red')
+            add_series(fig_weather, weather_filtered, "datetime", "out_hum", 'Humidity (%)', 'blue')
+            add_series(fig_weather, weather_filtered, "datetime", "wind_speed", 'Wind Speed (km/h)', 'green')
+            add_series(fig_weather, weather_filtered, "datetime", "bar", 'Barometric Pressure (hPa)', 'purple')
+            add_series(fig_weather, weather_filtered, "datetime", "rain_rate", 'Rain Rate (mm/hr)', 'teal')
+
+            fig_weather.update_layout(
+                xaxis_title="Time",
+                yaxis_title="Values",
+                height=450,
+                xaxis=dict(
+                    rangeslider=dict(visible=True),
+                    type="date",
+                    rangeselector=dict(
+                        buttons=[
+                            dict(count=1, label="1d", step="day", stepmode="backward"),
+                            dict(count=7, label="1w", step="day", stepmode="backward"),
+                            dict(step="all")
+                        ],
+                        x=0.5, y=1.15, xanchor='center', yanchor='bottom',
+                        bgcolor="#444", font=dict(color="#FFF"), activecolor="#74bcf7"
+                    )
+                ),
+                yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+                plot_bgcolor="white",
+                paper_bgcolor="lightblue",
+                font=dict(family="Georgia, serif", size=12, color="black"),
+                legend=dict(x=1.05, y=0.5, xanchor='left', yanchor='middle', bgcolor='rgba(255, 255, 255, 0.5)'),
+                margin=dict(l=80, r=80, t=50, b=80),
+            )
+
+            st.plotly_chart(fig_weather, use_container_width=True)
+            st.download_button("Download Weather Data", deferred(frame_export, weather_filtered, "csv", remove=True), "weather_data.csv", mime="text/csv")
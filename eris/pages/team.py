@@ -0,0 +1,54 @@
+"""Meet the Team."""
+import streamlit as st
+
+from eris.fragments import static_fragment
+from eris.pages.common import page_header_html
+from eris.thumbnails import responsive_img
+
+
+@static_fragment()
+def team_card_html(photo, name, subtitle):
+    picture = responsive_img(photo, sizes="250px", alt=name,
+                             style="width: 250px; height: 250px; object-fit: cover; border-radius: 8px;")
+    if not picture:
+        return None
+    return f"""
+        <div style="text-align: center;">
+            {picture}
+            <p style="font-weight: bold; margin-bottom: 4px;">{name}</p>
+            <p style="font-size: 0.9em; color: gray; margin-top: 0;">{subtitle}</p>
+        </div>
+        """
+
+
+def render():
+    # Title with Logos on Both Sides (built once per process)
+    st.markdown(page_header_html("Meet the Team"), unsafe_allow_html=True)
+
+    # Gallery Images, Captions & Subtitles
+    gallery_photos = [
+        "images/austinkarpf.jpg",
+        "images/kellyhorak.jpg",
+        "images/sophiamangrubang.jpg"
+    ]
+    gallery_captions = [
+        "Austin Karpf",
+        "Kelly Horak",
+        "Sophia Mangrubang"
+    ]
+    gallery_subtitles = [
+        "Software Engineer/Web Developer",
+        "Software Engineer/Web Developer",
+        "Software Engineer/Web Developer"
+    ]
+
+    # Display in columns
+    cols = st.columns(len(gallery_photos))
+
+    for i, col in enumerate(cols):
+        with col:
+            card = team_card_html(gallery_photos[i], gallery_captions[i], gallery_subtitles[i])
+            if card:
+                st.markdown(card, unsafe_allow_html=True)
+            else:
+                st.warning(f"Image not found: {gallery_photos[i]}")
@@ -0,0 +1,116 @@
+"""Weather Station History: the weather archive built by eris/weather.py."""
+import pandas as pd
+import plotly.graph_objs as go
+import streamlit as st
+
+from eris.archive import WEATHER_DIR, archive_bounds, load_weather, range_version
+from eris.charts import add_series
+from eris.diskcache import disk_cached
+from eris.downsample import DEFAULT_POINTS
+from eris.export import FORMATS, deferred, export_name, frame_export
+from eris.pages.common import page_header_html, show_disk_cache_stats
+from eris.table import paginated_table
+from eris.worker import ingest_worker
+
+# The station logs every 5 minutes; a longer pause means it was offline
+WEATHER_MAX_GAP = pd.Timedelta(minutes=30).to_timedelta64()
+
+
+# Only the months/row groups inside the range are read from the archive;
+# ``segments`` (see ``range_version``) changes when a sync adds rows to them
+@st.cache_data(ttl=3600, max_entries=16)
+@disk_cached("weather_range")
+def load_weather_range(start, end, segments):
+    return load_weather(start, end)
+
+
+@st.cache_data(ttl=600)
+def weather_archive_bounds():
+    return archive_bounds(WEATHER_DIR)
+
+
+def render():
+    # ✅ The first data page visited starts the Firestore poller that keeps the archive current
+    ingest_worker()
+    show_disk_cache_stats()
+
+    st.markdown(page_header_html("UW ERIS Weather Station"), unsafe_allow_html=True)
+
+    # ✅ Archive extent comes from Parquet footers, no rows are read here
+    first_time, last_time = weather_archive_bounds()
+    if last_time is None:
+        st.error(f"No archived weather data found in {WEATHER_DIR}. Run: python -m eris.weather new_weather_data.csv")
+        st.stop()
+
+    st.write("### Date Range Selection")
+    start_date = st.date_input("Start Date", value=max(first_time, last_time - pd.Timedelta(days=7)).date(),
+                               min_value=first_time.date(), max_value=last_time.date())
+    start_date = pd.to_datetime(start_date).tz_localize('UTC')
+
+    end_date = st.date_input("End Date", value=last_time.date(), min_value=start_date.date())
+    end_date = pd.to_datetime(end_date).tz_localize('UTC')
+
+    # ✅ Load only the selected range (end day inclusive)
+    try:
+        range_end = end_date + pd.Timedelta(days=1)
+        weather_data = load_weather_range(start_date, range_end, range_version(start_date, range_end, WEATHER_DIR))
+    except Exception as e:
+        st.error(f"Failed to load weather data: {e}")
+        st.stop()
+
+    if weather_data.empty:
+        st.warning("No weather data for the selected date range.")
+        return
+
+    weather_data = weather_data.rename(columns={'date': 'time'})
+
+    # ✅ Each series is downsampled to a screen-sized number of points unless every sample is requested
+    full_resolution = st.checkbox("Show every sample (slower for long ranges)", value=False, key="weather_full")
+    max_points = None if full_resolution else DEFAULT_POINTS
+
+    fig = go.Figure()
+    add_series(fig, weather_data, 'time', 'temp_out', 'Temp Out (°C)', 'red', max_points=max_points, max_gap=WEATHER_MAX_GAP)
+    add_series(fig, weather_data, 'time', 'out_hum', 'Humidity (%)', 'blue', max_points=max_points, max_gap=WEATHER_MAX_GAP)
+    add_series(fig, weather_data, 'time', 'wind_speed', 'Wind Speed (km/h)', 'green', max_points=max_points, max_gap=WEATHER_MAX_GAP)
+    add_series(fig, weather_data, 'time', 'bar', 'Barometric Pressure', 'purple', max_points=max_points, max_gap=WEATHER_MAX_GAP)
+    add_series(fig, weather_data, 'time', 'rain_rate', 'Rain Rate (mm/hr)', 'teal', max_points=max_points, max_gap=WEATHER_MAX_GAP)
+
+    fig.update_layout(
+        xaxis_title="Time",
+        yaxis_title="Values",
+        height=500,
+        xaxis=dict(
+            rangeslider=dict(visible=True),
+            type="date",
+            rangeselector=dict(
+                buttons=[
+                    dict(count=1, label="1d", step="day", stepmode="backward"),
+                    dict(count=7, label="1w", step="day", stepmode="backward"),
+                    dict(count=1, label="1m", step="month", stepmode="backward"),
+                    dict(step="all")
+                ],
+                x=0.5, y=1.15, xanchor='center', yanchor='bottom',
+                bgcolor="#444", font=dict(color="#FFF"), activecolor="#74bcf7"
+            )
+        ),
+        yaxis=dict(showgrid=True, gridcolor='lightgrey'),
+        plot_bgcolor="white",
+        paper_bgcolor="lightblue",
+        font=dict(family="Georgia, serif", size=12, color="black"),
+        legend=dict(x=1.05, y=0.5, xanchor='left', yanchor='middle', bgcolor='rgba(255, 255, 255, 0.5)'),
+        margin=dict(l=80, r=80, t=50, b=80),
+    )
+
+    st.plotly_chart(fig, use_container_width=True)
+
+    # ✅ The file is only written when the button is clicked
+    export_format = st.radio("Download format", list(FORMATS), format_func=lambda f: FORMATS[f].label, horizontal=True,
+                             key="weather_format")
+    st.download_button(
+        "Download Weather Data",
+        deferred(frame_export, weather_data, export_format, remove=True),
+        export_name("weather_data", export_format),
+        mime=FORMATS[export_format].mime,
+    )
+
+    paginated_table(weather_data, key="weather_history")
@@ -0,0 +1,71 @@
+"""Bounded, retried Firestore calls.
+
+Every Firestore round trip made by ``eris.ingest`` goes through
+``firestore_call``, which
+
+* holds one of ``MAX_CONCURRENT`` process-wide slots while it runs, so a
+  class full of students opening the live page at once cannot fan out into
+  dozens of parallel queries against our quota;
+* retries transient errors (unavailable, deadline exceeded, quota, aborted,
+  dropped connections) with full-jitter exponential backoff;
+* gives up once ``deadline`` seconds have passed, so a page render is never
+  stuck behind an outage. Callers then fall back to the last good data.
+"""
+import logging
+import random
+import threading
+import time
+
+log = logging.getLogger(__name__)
+
+MAX_CONCURRENT = 4
+
+# Seconds; total budget per call including retries, and backoff bounds
+DEADLINE = 20.0
+BASE_DELAY = 0.5
+MAX_DELAY = 8.0
+
+_slots = threading.BoundedSemaphore(MAX_CONCURRENT)
+
+
+def transient_errors():
+    """Exception types worth retrying."""
+    from google.api_core import exceptions
+
+    return (
+        exceptions.ServiceUnavailable,
+        exceptions.DeadlineExceeded,
+        exceptions.InternalServerError,
+        exceptions.TooManyRequests,
+        exceptions.ResourceExhausted,
+        exceptions.Aborted,
+        ConnectionError,
+        TimeoutError,
+    )
+
+
+def backoff(attempt, base=BASE_DELAY, cap=MAX_DELAY):
+    """Full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+def firestore_call(func, *args, deadline=DEADLINE, **kwargs):
+    """Run ``func(*args, **kwargs)`` in a concurrency slot, retrying transient errors until ``deadline``."""
+    retryable = transient_errors()
+    started = time.monotonic()
+    attempt = 0
+    while True:
+        remaining = deadline - (time.monotonic() - started)
+        if remaining <= 0 or not _slots.acquire(timeout=remaining):
+            raise TimeoutError(f"No Firestore slot free within {deadline:.0f}s")
+        try:
+            return func(*args, **kwargs)
+        except retryable as e:
+            delay = backoff(attempt)
+            attempt += 1
+            if time.monotonic() - started + delay >= deadline:
+                raise
+            log.warning("Transient Firestore error (attempt %d), retrying in %.1fs: %s", attempt, delay, e)
+        finally:
+            _slots.release()
+        time.sleep(delay)
@@ -0,0 +1,193 @@
+"""Pre-aggregated hourly / daily / monthly CTD rollups.
+
+For every sensor column the rollups hold ``<col>_min``, ``<col>_mean``,
+``<col>_max`` and ``<col>_count`` per time bucket. They are stored next to
+the archive, one file per resolution and month
+(``data/ctd_rollups/day/2019-03.parquet``), so appending new readings only
+recomputes the months those readings fall in.
+
+A decade-long chart then reads a few thousand daily rows instead of every
+raw sample. Rebuild everything with::
+
+    python -m eris.rollup
+"""
+import argparse
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+from eris.archive import ARCHIVE_DIR, SENSOR_COLUMNS, load_ctd, manifest_lock, partition_files, replace_atomically, to_epoch_ms
+
+ROLLUP_DIR = os.path.join("data", "ctd_rollups")
+
+# Finest to coarsest: name -> (pandas frequency, bucket length for choosing)
+RESOLUTIONS = {
+    "hour": ("h", pd.Timedelta(hours=1)),
+    "day": ("D", pd.Timedelta(days=1)),
+    "month": ("MS", pd.Timedelta(days=30)),
+}
+LABELS = {"hour": "Hourly", "day": "Daily", "month": "Monthly"}
+
+# The raw CTD sampling interval, used to estimate how many raw rows a range holds
+RAW_INTERVAL = pd.Timedelta(minutes=30)
+
+# A chart is drawn from the finest level that has at most this many rows
+MAX_CHART_ROWS = 5000
+
+STATS = ["min", "mean", "max", "count"]
+
+
+def rollup_path(resolution, year, month, rollup_root=ROLLUP_DIR):
+    return os.path.join(rollup_root, resolution, f"{year:04d}-{month:02d}.parquet")
+
+
+def aggregate(df, resolution):
+    """Raw archive rows -> one row per bucket with min/mean/max/count per sensor."""
+    freq, _ = RESOLUTIONS[resolution]
+    grouped = df.groupby(pd.Grouper(key="date", freq=freq))
+    out = grouped[SENSOR_COLUMNS].agg(STATS)
+    out.columns = [f"{col}_{stat}" for col, stat in out.columns]
+    for col in SENSOR_COLUMNS:
+        out[f"{col}_count"] = out[f"{col}_count"].astype("int32")
+        for stat in ("min", "mean", "max"):
+            out[f"{col}_{stat}"] = out[f"{col}_{stat}"].astype("float32")
+    counts = out[[f"{col}_count" for col in SENSOR_COLUMNS]].sum(axis=1)
+    return out[counts > 0].reset_index()
+
+
+def month_start(year, month):
+    return pd.Timestamp(year=year, month=month, day=1, tz="UTC")
+
+
+def update_months(months, root=ARCHIVE_DIR, rollup_root=ROLLUP_DIR):
+    """Recompute every resolution for the given (year, month) pairs.
+
+    Each month is read and rewritten under the archive's manifest lock, so
+    concurrent updaters (the app's worker, an import or a backfill) publish
+    in the order they read and never replace a rollup with an older one.
+    """
+    for year, month in sorted(set(months)):
+        start = month_start(year, month)
+        with manifest_lock(root):
+            raw = load_ctd(start, start + pd.offsets.MonthBegin(1), root=root)
+            for resolution in RESOLUTIONS:
+                path = rollup_path(resolution, year, month, rollup_root)
+                if raw.empty:
+                    if os.path.exists(path):
+                        os.remove(path)
+                    continue
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+                aggregate(raw, resolution).to_parquet(tmp, index=False)
+                replace_atomically(tmp, path)
+
+
+def update_for_rows(df, root=ARCHIVE_DIR, rollup_root=ROLLUP_DIR):
+    """Refresh the rollups of the months touched by newly appended rows."""
+    if df.empty:
+        return
+    dates = df["date"]
+    if pd.api.types.is_numeric_dtype(dates):
+        dates = pd.to_datetime(dates, unit="ms", utc=True)
+    update_months(zip(dates.dt.year, dates.dt.month), root, rollup_root)
+
+
+def rebuild(root=ARCHIVE_DIR, rollup_root=ROLLUP_DIR):
+    months = set()
+    for path in partition_files(root):
+        parts = os.path.normpath(path).split(os.sep)
+        months.add((int(parts[-3][5:]), int(parts[-2][6:])))
+    update_months(months, root, rollup_root)
+    return len(months)
+
+
+def rollup_files(resolution, start_ms=None, end_ms=None, rollup_root=ROLLUP_DIR):
+    """Rollup files of the months overlapping ``[start_ms, end_ms)``, oldest first."""
+    first = pd.Timestamp(start_ms, unit="ms") if start_ms is not None else None
+    last = pd.Timestamp(end_ms - 1, unit="ms") if end_ms is not None else None
+    folder = os.path.join(rollup_root, resolution)
+    names = sorted(os.listdir(folder)) if os.path.isdir(folder) else []
+    files = []
+    for name in names:
+        if not name.endswith(".parquet"):
+            continue
+        year, month = int(name[:4]), int(name[5:7])
+        if first is not None and (year, month) < (first.year, first.month):
+            continue
+        if last is not None and (year, month) > (last.year, last.month):
+            continue
+        files.append(os.path.join(folder, name))
+    return files
+
+
+def rollup_version(resolution, start=None, end=None, rollup_root=ROLLUP_DIR):
+    """Hashable version of the rollup rows in ``[start, end)``: (name, mtime, size) of their files."""
+    start_ms = to_epoch_ms(start) if start is not None else None
+    end_ms = to_epoch_ms(end) if end is not None else None
+    version = []
+    for path in rollup_files(resolution, start_ms, end_ms, rollup_root):
+        try:
+            info = os.stat(path)
+        except FileNotFoundError:
+            continue
+        version.append((os.path.basename(path), info.st_mtime_ns, info.st_size))
+    return tuple(version)
+
+
+def load_rollup(resolution, start=None, end=None, columns=None, rollup_root=ROLLUP_DIR):
+    """Rollup rows with ``start <= date < end``; ``columns`` picks sensors."""
+    start_ms = to_epoch_ms(start) if start is not None else None
+    end_ms = to_epoch_ms(end) if end is not None else None
+
+    wanted = None
+    if columns is not None:
+        wanted = ["date"] + [f"{col}_{stat}" for col in SENSOR_COLUMNS if col in columns for stat in STATS]
+    frames = []
+    for path in rollup_files(resolution, start_ms, end_ms, rollup_root):
+        try:
+            frames.append(pd.read_parquet(path, columns=wanted))
+        except FileNotFoundError:
+            # Removed by an update since the listing: the month has no rows left
+            continue
+    if not frames:
+        return pd.DataFrame(columns=wanted or ["date"])
+    df = pd.concat(frames, ignore_index=True)
+    mask = np.ones(len(df), dtype=bool)
+    if start_ms is not None:
+        mask &= (df["date"] >= pd.Timestamp(start_ms, unit="ms", tz="UTC")).to_numpy()
+    if end_ms is not None:
+        mask &= (df["date"] < pd.Timestamp(end_ms, unit="ms", tz="UTC")).to_numpy()
+    return df[mask].reset_index(drop=True)
+
+
+def mean_frame(df):
+    """Rollup rows -> ``date`` plus one column per sensor holding the bucket mean."""
+    means = {f"{col}_mean": col for col in SENSOR_COLUMNS if f"{col}_mean" in df}
+    return df[["date", *means]].rename(columns=means)
+
+
+def max_gap(resolution):
+    """Pause between buckets after which a chart line should break."""
+    return (2 * RESOLUTIONS[resolution][1]).to_timedelta64()
+
+
+def choose_resolution(start, end, max_rows=MAX_CHART_ROWS):
+    """Finest level ("raw", "hour", "day", "month") with at most ``max_rows`` rows for the range."""
+    span = pd.Timestamp(to_epoch_ms(end), unit="ms") - pd.Timestamp(to_epoch_ms(start), unit="ms")
+    if span / RAW_INTERVAL <= max_rows:
+        return "raw"
+    for resolution, (_, length) in RESOLUTIONS.items():
+        if span / length <= max_rows:
+            return resolution
+    return "month"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Rebuild all CTD rollups from the archive.")
+    parser.add_argument("--root", default=ARCHIVE_DIR, help="archive directory (default: %(default)s)")
+    parser.add_argument("--rollups", default=ROLLUP_DIR, help="rollup directory (default: %(default)s)")
+    args = parser.parse_args()
+    count = rebuild(args.root, args.rollups)
+    print(f"Rebuilt rollups for {count} months in {args.rollups}")
@@ -0,0 +1,67 @@
+"""Incremental Firestore -> archive sync of CTD readings past the watermark, and import of the Pi exports::
+
+    python -m eris.sync ctddata.csv output.json
+"""
+import argparse
+import os
+
+import pandas as pd
+
+from eris.archive import ARCHIVE_DIR, append_ctd, clean_ctd_frame, read_watermark, to_epoch_ms
+from eris.dedup import index_for
+from eris.ingest import CTD, PAGE_SIZE, ArchiveSink, run
+from eris.rollup import ROLLUP_DIR, update_for_rows
+
+# The Pi exports carry no instrument column
+PI_INSTRUMENT = "CTD"
+
+# Where to start when there is neither a watermark nor archived data
+DEFAULT_START = "2024-10-15"
+
+
+def sync_ctd(db, root=ARCHIVE_DIR, page_size=PAGE_SIZE, start=DEFAULT_START, rollup_root=ROLLUP_DIR, lookback=0):
+    """Append every CTD document newer than the watermark to the archive.
+
+    With ``lookback`` (ms, e.g. ``LOOKBACK_MS``) documents that much older
+    than the watermark are read again so late uploads are caught; the dedup
+    index drops the ones already archived. The watermark is advanced after
+    each page is written, so an interrupted run picks up where it stopped.
+    Returns the new rows (cleaned, as stored).
+    """
+    mark = read_watermark(root, CTD.collection)
+    first = mark + 1 - lookback if mark is not None else to_epoch_ms(start)
+    new = run(db, CTD, ArchiveSink(root), start=first, page_size=page_size)
+    update_for_rows(new, root, rollup_root)
+    return new
+
+
+def read_pi_export(path):
+    """A ctddata.csv / output.json export as a raw CTD frame (``time`` -> ``date``)."""
+    if path.endswith(".json"):
+        raw = pd.read_json(path, convert_dates=False)
+    else:
+        raw = pd.read_csv(path)
+    raw = raw.rename(columns={"time": "date"})
+    if "instrument" not in raw.columns:
+        raw["instrument"] = PI_INSTRUMENT
+    return raw
+
+
+def import_file(path, root=ARCHIVE_DIR, rollup_root=ROLLUP_DIR):
+    """Append the readings of a Pi export that are not archived yet; returns them."""
+    new = index_for(root).append_new(clean_ctd_frame(read_pi_export(path)), os.path.basename(path), append_ctd)
+    if not new.empty:
+        update_for_rows(new, root, rollup_root)
+    return new
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add Raspberry Pi CTD exports to the archive.")
+    parser.add_argument("paths", nargs="+", help="ctddata.csv and/or output.json files")
+    parser.add_argument("--root", default=ARCHIVE_DIR, help="archive directory (default: %(default)s)")
+    args = parser.parse_args()
+    for path in args.paths:
+        new = import_file(path, args.root)
+        print(f"{path}: {len(new)} new records")
+    for source, count in index_for(args.root).report().items():
+        print(f"{source}: {count} duplicates dropped")
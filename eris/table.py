@@ -0,0 +1,86 @@
+"""Paginated, server-side sorted and filtered data table for the CTD pages, run as a fragment."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+PAGE_SIZES = [50, 100, 500]
+
+NO_FILTER = "(none)"
+
+
+def filter_rows(df, column=None, low=None, high=None):
+    """Rows of ``df`` with ``low <= column <= high`` (either bound optional)."""
+    if column is None:
+        return df
+    mask = np.ones(len(df), dtype=bool)
+    values = df[column]
+    if low is not None:
+        mask &= (values >= low).to_numpy()
+    if high is not None:
+        mask &= (values <= high).to_numpy()
+    return df[mask]
+
+
+def sorted_page(df, sort_by, descending=False, page=1, page_size=PAGE_SIZES[0]):
+    """Rows of page ``page`` (1-based) of ``df`` sorted by ``sort_by``; missing values go last."""
+    order = df[sort_by].reset_index(drop=True).sort_values(ascending=not descending, kind="stable", na_position="last")
+    first = (page - 1) * page_size
+    return df.iloc[order.index[first:first + page_size]]
+
+
+def page_count(n_rows, page_size):
+    return max(1, -(-n_rows // page_size))
+
+
+def summary_stats(df, columns):
+    """count / mean / std / min / max for the numeric ``columns`` of ``df``."""
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c])]
+    return df[numeric].agg(["count", "mean", "std", "min", "max"]).T
+
+
+def finite_bounds(values):
+    """(min, max) of the finite values of a numeric column; None if it has none."""
+    values = pd.to_numeric(values, errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+    values = values[np.isfinite(values)]
+    if not len(values):
+        return None
+    return float(values.min()), float(values.max())
+
+
+@st.fragment
+def paginated_table(df, columns=None, key="table"):
+    """Sortable, filterable table showing one page of ``df`` at a time."""
+    columns = columns or list(df.columns)
+    df = df[columns]
+    numeric = [c for c in columns if pd.api.types.is_numeric_dtype(df[c])]
+
+    sort_col, order_col, size_col = st.columns(3)
+    sort_by = sort_col.selectbox("Sort by", columns, key=f"{key}_sort")
+    descending = order_col.radio("Order", ["Ascending", "Descending"], horizontal=True, key=f"{key}_order") == "Descending"
+    page_size = size_col.selectbox("Rows per page", PAGE_SIZES, key=f"{key}_size")
+
+    # Columns without a single finite value (e.g. all NaN) cannot be filtered
+    bounds = {c: finite_bounds(df[c]) for c in numeric}
+    filter_col, low_col, high_col = st.columns(3)
+    column = filter_col.selectbox("Filter column", [NO_FILTER] + [c for c in numeric if bounds[c]], key=f"{key}_filter")
+    if column != NO_FILTER:
+        lowest, highest = bounds[column]
+        low = low_col.number_input("Min", value=lowest, key=f"{key}_low_{column}")
+        high = high_col.number_input("Max", value=highest, key=f"{key}_high_{column}")
+        # Rows missing the value are only dropped once the range is narrowed
+        if low > lowest or high < highest:
+            df = filter_rows(df, column, low, high)
+
+    n_pages = page_count(len(df), page_size)
+    page_key = f"{key}_page"
+    if st.session_state.get(page_key, 1) > n_pages:
+        st.session_state[page_key] = n_pages
+    page = st.number_input("Page", min_value=1, max_value=n_pages, step=1, key=page_key)
+
+    rows = sorted_page(df, sort_by, descending, page, page_size)
+    st.dataframe(rows, use_container_width=True, hide_index=True)
+    first = (page - 1) * page_size
+    st.caption(f"Rows {min(first + 1, len(df)):,}-{first + len(rows):,} of {len(df):,}")
+
+    with st.expander("Summary statistics"):
+        st.dataframe(summary_stats(df, numeric), use_container_width=True)
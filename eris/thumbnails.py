@@ -0,0 +1,98 @@
+"""Resized WebP/JPEG derivatives of the gallery photos, served through ``<picture>``/``srcset`` markup."""
+import functools
+import html
+import os
+
+from PIL import Image, ImageOps
+
+from eris.assets import ASSET_DIR, URL_PREFIX, content_hash, file_version, image_src, static_serving
+
+WIDTHS = (320, 640, 1280)
+
+# extension -> (Pillow format, MIME type, save options)
+ENCODINGS = {
+    "webp": ("WEBP", "image/webp", {"quality": 80, "method": 4}),
+    "jpg": ("JPEG", "image/jpeg", {"quality": 82, "optimize": True, "progressive": True}),
+}
+
+
+def derivative_name(path, width, ext):
+    stem = os.path.splitext(os.path.basename(path))[0].replace(" ", "-")
+    return f"{stem}.{content_hash(path)}.w{width}.{ext}"
+
+
+def target_widths(source_width, widths=WIDTHS):
+    """Requested widths that do not upscale; at least one (the original width, capped)."""
+    fitting = [w for w in widths if w < source_width]
+    return fitting + [min(source_width, max(widths))]
+
+
+def make_derivatives(path, widths=WIDTHS, asset_dir=ASSET_DIR):
+    """Write any missing derivatives of ``path``; returns ``{ext: [(width, name), ...]}``."""
+    with Image.open(path) as source:
+        # Camera JPEGs are often stored sideways with an EXIF rotation flag
+        image = ImageOps.exif_transpose(source)
+        image.load()
+    made = {ext: [] for ext in ENCODINGS}
+    os.makedirs(asset_dir, exist_ok=True)
+    for width in target_widths(image.width, widths):
+        resized = None
+        for ext, (fmt, _, options) in ENCODINGS.items():
+            name = derivative_name(path, width, ext)
+            target = os.path.join(asset_dir, name)
+            if not os.path.exists(target):
+                if resized is None:
+                    height = max(1, round(image.height * width / image.width))
+                    resized = image.convert("RGB").resize((width, height), Image.LANCZOS)
+                tmp = f"{target}.{os.getpid()}.tmp"
+                resized.save(tmp, fmt, **options)
+                os.replace(tmp, target)
+            made[ext].append((width, name))
+    return made
+
+
+def srcset(entries):
+    return ", ".join(f"{URL_PREFIX}/{name} {width}w" for width, name in entries)
+
+
+@functools.lru_cache(maxsize=256)
+def _picture(path, version, sizes, alt, style, extra):
+    made = make_derivatives(path)
+    jpegs = made["jpg"]
+    # Plain src for browsers without srcset support: a mid-sized JPEG
+    fallback = jpegs[min(1, len(jpegs) - 1)][1]
+    return (
+        f'<picture><source type="{ENCODINGS["webp"][1]}" srcset="{srcset(made["webp"])}" sizes="{sizes}">'
+        f'<img src="{URL_PREFIX}/{fallback}" srcset="{srcset(jpegs)}" sizes="{sizes}" alt="{alt}" style="{style}"{extra}>'
+        f"</picture>"
+    )
+
+
+def responsive_img(path, sizes="100vw", alt="", style="", lazy=False):
+    """``<picture>`` markup for ``path`` sized for a slot of CSS width ``sizes``; None if missing.
+
+    ``lazy`` lets the browser defer the download until the photo scrolls
+    into view (``loading="lazy"``).
+    """
+    version = file_version(path)
+    if version is None:
+        return None
+    alt = html.escape(alt, quote=True)
+    extra = ' loading="lazy" decoding="async"' if lazy else ""
+    if static_serving():
+        try:
+            return _picture(path, version, sizes, alt, style, extra)
+        except OSError:
+            pass
+    return f'<img src="{image_src(path)}" alt="{alt}" style="{style}"{extra}>'
+
+
+if __name__ == "__main__":
+    from eris.assets import IMAGE_DIR, IMAGE_EXTENSIONS
+
+    count = 0
+    for name in sorted(os.listdir(IMAGE_DIR)):
+        if name.lower().endswith(IMAGE_EXTENSIONS):
+            made = make_derivatives(os.path.join(IMAGE_DIR, name))
+            count += sum(len(entries) for entries in made.values())
+    print(f"{count} derivatives in {ASSET_DIR}")
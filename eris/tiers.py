@@ -0,0 +1,234 @@
+"""Two-tier (cold/hot) in-memory cache for the live CTD page.
+
+* cold: sealed days before today (UTC). They never change, live on disk in
+  the archive and are loaded into memory once per process.
+* hot: today's readings. Each refresh runs the incremental sync, so only
+  documents newer than the watermark are fetched (plus, hourly, a lookback
+  for late uploads; see ``LookbackSchedule``) and appended.
+
+When the date rolls over, the previous day's hot rows are promoted into
+the cold tier; they are already on disk because the sync wrote them. The
+cold tier starts at the current quarter (``quarter_start``), so on the
+first day of a quarter the older days are dropped from memory.
+Keep one instance per server so every session shares it; the ingestion
+worker (``eris.worker``) refreshes it in the background and page renders
+only read from memory.
+
+``TodayWeather`` is the single-tier equivalent for today's weather
+readings: each refresh syncs the weather archive and re-reads today's
+rows from it.
+"""
+import threading
+import time
+
+import pandas as pd
+
+from eris.archive import ARCHIVE_DIR, WEATHER_DIR, load_ctd, load_weather, range_version, to_epoch_ms
+from eris.ingest import LOOKBACK_INTERVAL, LOOKBACK_MS
+from eris.sync import sync_ctd
+from eris.weather import sync_weather
+
+
+def utc_today():
+    return pd.Timestamp.now(tz="UTC").normalize()
+
+
+def as_utc(value):
+    """Timestamp in UTC; naive values are taken as UTC like everywhere in the archive."""
+    return pd.Timestamp(to_epoch_ms(value), unit="ms", tz="UTC")
+
+
+def quarter_start(day):
+    """Midnight UTC on the first day of the calendar quarter containing ``day``."""
+    day = as_utc(day)
+    return pd.Timestamp(year=day.year, month=3 * ((day.month - 1) // 3) + 1, day=1, tz="UTC")
+
+
+class LookbackSchedule:
+    """When a sync should also re-read ``LOOKBACK_MS`` behind the watermark: first, then every ``interval`` s."""
+
+    def __init__(self, interval=LOOKBACK_INTERVAL):
+        self.interval = interval
+        self.swept_at = None
+
+    def due(self):
+        """The lookback (ms) for the next sync; 0 until it is due again."""
+        if self.swept_at is not None and time.monotonic() - self.swept_at < self.interval:
+            return 0
+        return LOOKBACK_MS
+
+    def done(self, lookback):
+        if lookback:
+            self.swept_at = time.monotonic()
+
+
+class TieredCtdCache:
+    def __init__(self, db, root=ARCHIVE_DIR, clock=utc_today, window=quarter_start):
+        self.db = db
+        self.root = root
+        self.clock = clock
+        # today -> first day held in the cold tier
+        self.window = window
+        self.cold_start = None
+        self.lock = threading.Lock()
+        self.day = None
+        self.cold = None
+        self.hot = None
+        self.refreshed_at = 0.0
+        self.sweep = LookbackSchedule()
+        # (key, rows) of the last read from before cold_start, see ``archived``
+        self.before = None
+        # Wall-clock time of the last successful sync, and the error of the last failed one
+        self.synced_at = None
+        self.last_error = None
+
+    def load(self):
+        """Fill both tiers from the archive, without any Firestore round trip."""
+        with self.lock:
+            self._load(self.clock())
+
+    def _load(self, today):
+        if self.cold is None:
+            self.cold_start = self.window(today)
+            self.cold = load_ctd(self.cold_start, today, root=self.root)
+            self.hot = load_ctd(today, root=self.root)
+            self.day = today
+        elif today != self.day:
+            self._promote(today)
+
+    def refresh(self, max_age=0):
+        """Bring the hot tier up to date; no-op if refreshed < ``max_age`` s ago.
+
+        A failed sync is recorded in ``last_error`` and re-raised; the tiers
+        keep serving the last good data (see ``stale``).
+        """
+        with self.lock:
+            self._load(self.clock())
+            if time.monotonic() - self.refreshed_at < max_age:
+                return
+            lookback = self.sweep.due()
+            try:
+                new = sync_ctd(self.db, self.root, lookback=lookback)
+            except Exception as e:
+                # Readers keep the data already held; the next attempt waits max_age
+                self.refreshed_at = time.monotonic()
+                self.last_error = e
+                raise
+            self.refreshed_at = time.monotonic()
+            self.synced_at = pd.Timestamp.now(tz="UTC")
+            self.last_error = None
+            self.sweep.done(lookback)
+            if new.empty:
+                return
+            new = new.assign(date=pd.to_datetime(new["date"], unit="ms", utc=True))
+            # Days before cold_start are read from the archive, not held here
+            new = new[new["date"] >= self.cold_start]
+            # Late readings for an already sealed day go straight to the cold tier
+            late = new["date"] < self.day
+            if late.any():
+                self.cold = self._concat(self.cold, new[late])
+            self.hot = self._concat(self.hot, new[~late])
+
+    @property
+    def stale(self):
+        return self.last_error is not None
+
+    def _promote(self, today):
+        sealed = self.hot["date"] < today
+        self.cold = self._concat(self.cold, self.hot[sealed])
+        self.hot = self.hot[~sealed].reset_index(drop=True)
+        self.day = today
+        cold_start = self.window(today)
+        if cold_start != self.cold_start:
+            # Days that left the window are read from the archive from now on
+            self.cold = self.cold[self.cold["date"] >= cold_start].reset_index(drop=True)
+            self.cold_start = cold_start
+
+    @staticmethod
+    def _concat(a, b):
+        if b.empty:
+            return a
+        if a.empty:
+            return b.reset_index(drop=True)
+        return pd.concat([a, b], ignore_index=True).sort_values("date", kind="stable").reset_index(drop=True)
+
+    def archived(self, start=None):
+        """Archived rows from ``start`` to ``cold_start``.
+
+        The last read is kept until the segments of its months change, so
+        reruns of the live page with the same start do not re-read it.
+        """
+        with self.lock:
+            cold_start = self.cold_start
+        key = (start, cold_start, range_version(start, cold_start, self.root))
+        with self.lock:
+            if self.before is not None and self.before[0] == key:
+                return self.before[1]
+        df = load_ctd(start, cold_start, root=self.root)
+        with self.lock:
+            self.before = (key, df)
+        return df
+
+    def frame(self, start=None, end=None):
+        """Rows with ``start <= date < end`` from both tiers.
+
+        Ranges reaching back before ``cold_start`` read those days from the
+        archive (see ``archived``).
+        """
+        if self.cold is None:
+            self.load()
+        start_ts = as_utc(start) if start is not None else None
+        end_ts = as_utc(end) if end is not None else None
+        with self.lock:
+            parts = [self.cold, self.hot]
+            cold_start = self.cold_start
+        if start_ts is None or start_ts < cold_start:
+            parts.insert(0, self.archived(start_ts))
+        frames = []
+        for df in parts:
+            mask = pd.Series(True, index=df.index)
+            if start_ts is not None:
+                mask &= df["date"] >= start_ts
+            if end_ts is not None:
+                mask &= df["date"] < end_ts
+            if mask.any():
+                frames.append(df[mask])
+        if not frames:
+            return self.hot.iloc[0:0].copy()
+        return pd.concat(frames, ignore_index=True)
+
+
+class TodayWeather:
+    def __init__(self, db, root=WEATHER_DIR, clock=utc_today):
+        self.db = db
+        self.root = root
+        self.clock = clock
+        self.lock = threading.Lock()
+        self.frame = None
+        self.sweep = LookbackSchedule()
+        self.synced_at = None
+        self.last_error = None
+
+    def refresh(self):
+        """Sync the weather archive and reload today's rows; on failure keep the last good frame and re-raise."""
+        lookback = self.sweep.due()
+        try:
+            sync_weather(self.db, self.root, lookback=lookback)
+        except Exception as e:
+            self.last_error = e
+            raise
+        self.sweep.done(lookback)
+        df = load_weather(self.clock(), root=self.root).rename(columns={"date": "datetime"})
+        df["datetime"] = df["datetime"].dt.tz_convert(None)
+        with self.lock:
+            self.frame = df if not df.empty else None
+            self.synced_at = pd.Timestamp.now(tz="UTC")
+            self.last_error = None
+
+    @property
+    def stale(self):
+        return self.last_error is not None
+
+    def today_frame(self):
+        with self.lock:
+            return self.frame
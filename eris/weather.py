@@ -0,0 +1,48 @@
+"""Weather station archive: Firestore sync and WeatherLink imports.
+
+The weather readings are kept in their own partitioned archive
+(``data/weather/``, see eris/archive.py), filled from two sources:
+
+* ``sync_weather`` appends the ``Weather_Data`` documents newer than the
+  archive's watermark, like the CTD sync; the ingestion worker runs it;
+* ``import_export`` loads a Davis WeatherLink export (eris/weatherlink.py),
+  so years of station history can be added at once::
+
+      python -m eris.weather new_weather_data.csv weatherdata.csv
+
+Readings already archived are skipped by the dedup index either way.
+"""
+import argparse
+import os
+
+from eris.archive import WEATHER_DIR, append_weather, clean_weather_frame, read_watermark, to_epoch_ms
+from eris.dedup import index_for
+from eris.ingest import PAGE_SIZE, WEATHER, ArchiveSink, run
+from eris.weatherlink import read_export
+
+# Where to start when there is neither a watermark nor archived data
+DEFAULT_START = "2024-10-15"
+
+
+def sync_weather(db, root=WEATHER_DIR, page_size=PAGE_SIZE, start=DEFAULT_START, lookback=0):
+    """Append every weather document newer than the watermark (less ``lookback`` ms, see ``sync_ctd``); returns the new rows."""
+    mark = read_watermark(root, WEATHER.collection)
+    first = mark + 1 - lookback if mark is not None else to_epoch_ms(start)
+    return run(db, WEATHER, ArchiveSink(root), start=first, page_size=page_size)
+
+
+def import_export(path, root=WEATHER_DIR):
+    """Append the readings of a WeatherLink export that are not archived yet; returns them."""
+    return index_for(root).append_new(clean_weather_frame(read_export(path)), os.path.basename(path), append_weather)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Add WeatherLink exports to the weather archive.")
+    parser.add_argument("paths", nargs="+", help="e.g. new_weather_data.csv weatherdata.csv")
+    parser.add_argument("--root", default=WEATHER_DIR, help="archive directory (default: %(default)s)")
+    args = parser.parse_args()
+    for path in args.paths:
+        new = import_export(path, args.root)
+        print(f"{path}: {len(new)} new records")
+    for source, count in index_for(args.root).report().items():
+        print(f"{source}: {count} duplicates dropped")
@@ -0,0 +1,127 @@
+"""Parser for Davis WeatherLink text exports (weatherdata.csv, new_weather_data.csv).
+
+The exports split every column name over two header rows ("Temp" above
+"Out", "Hi" above "Temp"), may start with a byte order mark, may have a
+row of dashes under the header, write missing values as ``---`` and
+timestamps as a date column plus a 12-hour time ("5:15 PM" or "12:05a").
+Which columns appear depends on the station's sensors: one of our files
+has the Solar/UV/ET columns, the other does not.
+
+``read_export`` merges the header rows into one name per column, maps the
+names onto the Firestore weather schema (``eris.ingest.WEATHER``) and
+returns the same typed frame the Firestore path produces: a UTC
+``datetime`` column, float64 readings and a string ``wind_dir``. Columns
+the schema does not know are kept under snake_case names with
+``extra=True``. All parsing is done column-wise by pandas.
+
+Values keep the units the station was set to export.
+"""
+import argparse
+import csv
+import logging
+import re
+
+import pandas as pd
+
+from eris.ingest import WEATHER
+
+log = logging.getLogger(__name__)
+
+# The station logs in local time
+STATION_TZ = "America/Los_Angeles"
+
+MISSING = ["---", "------"]
+
+# Merged header -> schema column where the snake_case name differs
+ALIASES = {
+    "Hi Temp": "temp_hi",
+    "Low Temp": "temp_low",
+    "Dew Pt.": "dew_pt",
+}
+
+
+def column_name(top, bottom):
+    """Canonical name of a column from its two header cells ("Hi", "Temp" -> "temp_hi")."""
+    merged = " ".join(part.strip() for part in (top, bottom) if part.strip())
+    if merged in ALIASES:
+        return ALIASES[merged]
+    return re.sub(r"[^0-9a-z]+", "_", merged.lower()).strip("_")
+
+
+def read_header(path):
+    """(column names, number of lines before the data) of an export."""
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        rows = [row for _, row in zip(range(3), csv.reader(f))]
+    if len(rows) < 2:
+        raise ValueError(f"{path} is not a WeatherLink export: expected a two-row header")
+    top, bottom = rows[0], rows[1]
+    top += [""] * (len(bottom) - len(top))
+    names = [column_name(a, b) for a, b in zip(top, bottom)]
+    if names[:2] != ["date", "time"]:
+        raise ValueError(f"{path} is not a WeatherLink export: first columns are {names[:2]}")
+    dashed = len(rows) > 2 and all(set(cell.strip()) <= {"-"} for cell in rows[2])
+    return names, 3 if dashed else 2
+
+
+def parse_times(dates, times, tz=STATION_TZ):
+    """UTC timestamps from the Date and Time columns ("12:05a", "5:15 PM" or "17:15")."""
+    times = times.str.strip().str.upper()
+    twelve_hour = times.str.contains(r"[AP]M?$", regex=True)
+    # "12:05A" -> "12:05 AM"
+    times = times.str.replace(r"\s*([AP])M?$", r" \1M", regex=True)
+    stamps = dates.str.strip() + " " + times
+    local = pd.Series(pd.NaT, index=stamps.index, dtype="datetime64[ns]")
+    local[twelve_hour] = pd.to_datetime(stamps[twelve_hour], format="%m/%d/%Y %I:%M %p", errors="coerce")
+    local[~twelve_hour] = pd.to_datetime(stamps[~twelve_hour], format="%m/%d/%Y %H:%M", errors="coerce")
+    try:
+        local = local.dt.tz_localize(tz, ambiguous="infer", nonexistent="shift_forward")
+    except ValueError:
+        # The repeated hour of a DST change cannot be told apart; drop it
+        local = local.dt.tz_localize(tz, ambiguous="NaT", nonexistent="shift_forward")
+    return local.dt.tz_convert("UTC")
+
+
+def read_export(path, tz=STATION_TZ, extra=False):
+    """A WeatherLink export as a frame shaped like the Firestore weather data, sorted by time."""
+    names, skip = read_header(path)
+    raw = pd.read_csv(
+        path,
+        header=None,
+        names=names,
+        skiprows=skip,
+        encoding="utf-8-sig",
+        na_values=MISSING,
+        skipinitialspace=True,
+        dtype=str,
+        index_col=False,
+    )
+    raw = raw.dropna(how="all")
+
+    frame = pd.DataFrame({WEATHER.time_column: parse_times(raw["date"].fillna(""), raw["time"].fillna(""), tz)})
+    for name in WEATHER.numeric:
+        frame[name] = pd.to_numeric(raw[name], errors="coerce").astype("float64") if name in raw else float("nan")
+    for name in WEATHER.text:
+        frame[name] = raw[name].str.strip().astype("string") if name in raw else pd.Series(pd.NA, index=raw.index, dtype="string")
+    if extra:
+        known = {"date", "time", *WEATHER.numeric, *WEATHER.text}
+        for name in names:
+            if name not in known and name:
+                frame[name] = pd.to_numeric(raw[name], errors="coerce")
+
+    bad = frame[WEATHER.time_column].isna()
+    if bad.any():
+        log.warning("%s: %d rows without a usable date/time dropped", path, int(bad.sum()))
+    missing = [name for name in WEATHER.numeric + WEATHER.text if name not in raw]
+    if missing:
+        log.info("%s has no %s columns", path, ", ".join(missing))
+    return frame[~bad].sort_values(WEATHER.time_column, kind="stable").reset_index(drop=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parse WeatherLink exports and summarise them.")
+    parser.add_argument("paths", nargs="+", help="e.g. weatherdata.csv new_weather_data.csv")
+    args = parser.parse_args()
+    for path in args.paths:
+        df = read_export(path)
+        first, last = df[WEATHER.time_column].min(), df[WEATHER.time_column].max()
+        print(f"{path}: {len(df)} readings, {first} to {last}")
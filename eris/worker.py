@@ -0,0 +1,101 @@
+"""Background thread, one per server process, that keeps the live caches and the archives in sync with Firestore."""
+import logging
+import threading
+
+import streamlit as st
+
+from eris.retry import backoff
+
+log = logging.getLogger(__name__)
+
+# Seconds between polls; the CTD reports every 30 minutes
+POLL_INTERVAL = 60
+
+
+def live_sources():
+    """The caches the worker keeps up to date, filled from local data only."""
+    from eris.firebase import get_db
+    from eris.tiers import TieredCtdCache, TodayWeather
+
+    db = get_db()
+    ctd = TieredCtdCache(db)
+    ctd.load()
+    return {"ctd": ctd, "weather": TodayWeather(db), "compaction": ArchiveCompaction()}
+
+
+class ArchiveCompaction:
+    """Worker job that compacts the CTD and weather archives (see ``eris.archive.compact``)."""
+
+    def refresh(self):
+        from eris.archive import ARCHIVE_DIR, WEATHER_DIR, compact
+
+        for root in (ARCHIVE_DIR, WEATHER_DIR):
+            compact(root)
+
+
+class IngestWorker(threading.Thread):
+    def __init__(self, build_sources=live_sources, interval=POLL_INTERVAL):
+        super().__init__(name="eris-ingest", daemon=True)
+        self.build_sources = build_sources
+        self.interval = interval
+        self.sources = {}
+        self.error = None
+        self.ready = threading.Event()
+        self.stopping = threading.Event()
+
+    def run(self):
+        if not self.start_sources():
+            return
+        while not self.stopping.is_set():
+            self.poll()
+            self.stopping.wait(self.interval)
+
+    def start_sources(self):
+        """Build the sources, retrying with backoff until it works; False if stopped first.
+
+        Pages waiting in ``source`` are released after the first attempt
+        and see None until a retry succeeds.
+        """
+        attempt = 0
+        while not self.stopping.is_set():
+            try:
+                self.sources = self.build_sources()
+                self.error = None
+                return True
+            except Exception as e:
+                log.exception("Ingestion worker could not start (attempt %d)", attempt + 1)
+                self.error = e
+            finally:
+                self.ready.set()
+            self.stopping.wait(backoff(attempt, cap=self.interval))
+            attempt += 1
+        return False
+
+    def poll(self):
+        # Each source records its own failure (``stale``) and keeps its last good data
+        for name, source in self.sources.items():
+            try:
+                source.refresh()
+            except Exception as e:
+                log.warning("Ingesting %s failed: %s", name, e)
+
+    def source(self, name, timeout=None):
+        """The named cache once it is loaded; None while the worker cannot start."""
+        self.ready.wait(timeout)
+        return self.sources.get(name)
+
+    def stop(self):
+        self.stopping.set()
+
+
+def stop_worker(worker):
+    """Stop a worker dropped from the resource cache before its replacement runs alongside it."""
+    worker.stop()
+    worker.join(POLL_INTERVAL)
+
+
+@st.cache_resource(show_spinner=False, on_release=stop_worker)
+def ingest_worker():
+    worker = IngestWorker()
+    worker.start()
+    return worker
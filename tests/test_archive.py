@@ -0,0 +1,235 @@
+import multiprocessing
+import os
+import threading
+from unittest import mock
+
+import pandas as pd
+import pytest
+
+from eris import archive
+from eris.archive import (
+    append_ctd,
+    archive_bounds,
+    clean_ctd_frame,
+    collect_garbage,
+    compact,
+    convert_csv,
+    load_ctd,
+    raise_watermark,
+    read_manifest,
+    read_watermark,
+)
+from eris.dedup import DedupIndex
+
+START_MS = 1_700_000_000_000  # 2023-11-14 22:13:20 UTC
+STEP_MS = 30 * 60 * 1000
+
+
+def ctd_rows(first, count, instrument="CTD"):
+    """A cleaned CTD frame of ``count`` half-hourly readings starting at reading ``first``."""
+    return clean_ctd_frame(pd.DataFrame({
+        "date": [START_MS + (first + i) * STEP_MS for i in range(count)],
+        "instrument": instrument,
+        "temperature": [float(first + i) for i in range(count)],
+    }))
+
+
+def live_names(root):
+    return [name for names in read_manifest(root).values() for name in names]
+
+
+def archived_keys(root):
+    df = load_ctd(root=str(root))
+    return list(zip(df["instrument"], df["date"]))
+
+
+def append_unique(root, df):
+    DedupIndex(root).append_new(df, "test", append_ctd)
+
+
+def run_all(targets):
+    for t in targets:
+        t.start()
+    for t in targets:
+        t.join()
+
+
+def test_append_round_trip(tmp_path):
+    root = str(tmp_path)
+    append_ctd(ctd_rows(0, 10), root)
+    append_ctd(ctd_rows(10, 5), root)
+
+    df = load_ctd(root=root)
+    assert len(df) == 15
+    assert df["date"].is_monotonic_increasing
+    assert df["temperature"].tolist() == [float(i) for i in range(15)]
+    assert len(live_names(root)) == 2
+
+
+def test_load_filters_range(tmp_path):
+    root = str(tmp_path)
+    append_ctd(ctd_rows(0, 10), root)
+    start = pd.Timestamp(START_MS + 2 * STEP_MS, unit="ms", tz="UTC")
+    end = pd.Timestamp(START_MS + 5 * STEP_MS, unit="ms", tz="UTC")
+    assert load_ctd(start, end, root=root)["temperature"].tolist() == [2.0, 3.0, 4.0]
+
+
+def test_compact_round_trip(tmp_path):
+    root = str(tmp_path)
+    for first in (6, 0, 3):
+        append_ctd(ctd_rows(first, 3), root)
+    before = load_ctd(root=root)
+
+    assert compact(root, min_segments=2) == 1
+    assert len(live_names(root)) == 1
+    pd.testing.assert_frame_equal(load_ctd(root=root), before)
+
+    # Replaced segments are only deleted after the grace period
+    collect_garbage(root, grace=0)
+    partition = os.path.join(root, *next(iter(read_manifest(root))).split("/"))
+    assert [f for f in os.listdir(partition) if f.endswith(".parquet")] == live_names(root)
+
+
+def test_archive_bounds_cover_every_segment(tmp_path):
+    root = str(tmp_path)
+    # Late uploads: the last segment written is not the one with the newest reading
+    append_ctd(ctd_rows(5, 1), root)
+    append_ctd(ctd_rows(9, 1), root)
+    append_ctd(ctd_rows(0, 1), root)
+    first, last = archive_bounds(root)
+    assert first == pd.Timestamp(START_MS, unit="ms", tz="UTC")
+    assert last == pd.Timestamp(START_MS + 9 * STEP_MS, unit="ms", tz="UTC")
+
+
+def test_dedup_round_trip(tmp_path):
+    root = str(tmp_path)
+    index = DedupIndex(root)
+    assert len(index.append_new(ctd_rows(0, 10), "first", append_ctd)) == 10
+
+    # Repeats of archived readings and within the batch are dropped
+    batch = pd.concat([ctd_rows(5, 10), ctd_rows(14, 1)], ignore_index=True)
+    new = index.append_new(batch, "second", append_ctd)
+    assert new["temperature"].tolist() == [float(i) for i in range(10, 15)]
+    assert index.report() == {"second": 6}
+
+    # Another instrument at the same times is not a duplicate
+    assert len(index.append_new(ctd_rows(0, 3, instrument="CTD-2"), "third", append_ctd)) == 3
+    assert len(load_ctd(root=root)) == 18
+
+
+def test_dedup_index_rebuilds_after_compaction(tmp_path):
+    root = str(tmp_path)
+    for first in (0, 3):
+        DedupIndex(root).append_new(ctd_rows(first, 3), "test", append_ctd)
+    compact(root, min_segments=2)
+
+    index = DedupIndex(root)
+    assert index.append_new(ctd_rows(0, 6), "again", append_ctd).empty
+    assert index.report() == {"again": 6}
+
+
+def test_concurrent_appends_keep_every_segment(tmp_path):
+    root = str(tmp_path)
+    # Same date span in every thread, so segment names would collide without a unique suffix
+    threads = [threading.Thread(target=append_ctd, args=(ctd_rows(0, 4, instrument=f"CTD-{i}"), root)) for i in range(8)]
+    run_all(threads)
+
+    names = live_names(root)
+    assert len(names) == len(set(names)) == 8
+    assert len(load_ctd(root=root)) == 32
+
+
+@pytest.mark.parametrize("workers", ["threads", "processes"])
+def test_concurrent_dedup_appends_archive_each_reading_once(tmp_path, workers):
+    root = str(tmp_path)
+    df = ctd_rows(0, 20)
+    if workers == "threads":
+        index = DedupIndex(root)
+        targets = [threading.Thread(target=index.append_new, args=(df, "test", append_ctd)) for _ in range(6)]
+    else:
+        targets = [multiprocessing.Process(target=append_unique, args=(root, df)) for _ in range(6)]
+    run_all(targets)
+
+    keys = archived_keys(root)
+    assert len(keys) == len(set(keys)) == 20
+
+
+def test_concurrent_compactions_keep_one_merged_segment(tmp_path):
+    root = str(tmp_path)
+    for first in range(0, 30, 3):
+        append_ctd(ctd_rows(first, 3), root)
+
+    # Every compactor reads the manifest before any of them publishes
+    barrier = threading.Barrier(4)
+    real_read_manifest = archive.read_manifest
+    calls = threading.local()
+
+    def read_manifest_in_step(root=archive.ARCHIVE_DIR):
+        if not getattr(calls, "waited", False):
+            calls.waited = True
+            segments = real_read_manifest(root)
+            barrier.wait()
+            return segments
+        return real_read_manifest(root)
+
+    with mock.patch.object(archive, "read_manifest", read_manifest_in_step):
+        run_all([threading.Thread(target=compact, args=(root, 2)) for _ in range(4)])
+
+    assert len(live_names(root)) == 1
+    keys = archived_keys(root)
+    assert len(keys) == len(set(keys)) == 30
+
+
+def test_compaction_concurrent_with_appends(tmp_path):
+    root = str(tmp_path)
+    for first in range(0, 12, 3):
+        append_ctd(ctd_rows(first, 3), root)
+
+    threads = [threading.Thread(target=compact, args=(root, 2))]
+    threads += [threading.Thread(target=append_ctd, args=(ctd_rows(first, 3), root)) for first in range(12, 24, 3)]
+    run_all(threads)
+
+    keys = archived_keys(root)
+    assert len(keys) == len(set(keys)) == 24
+
+
+def die_holding_lock(root):
+    with archive.manifest_lock(root):
+        os._exit(1)
+
+
+def test_lock_of_a_crashed_process_is_released(tmp_path):
+    root = str(tmp_path)
+    child = multiprocessing.Process(target=die_holding_lock, args=(root,))
+    run_all([child])
+    assert child.exitcode == 1
+
+    acquired = threading.Event()
+
+    def acquire():
+        with archive.manifest_lock(root):
+            acquired.set()
+
+    thread = threading.Thread(target=acquire, daemon=True)
+    thread.start()
+    assert acquired.wait(5)
+
+
+def test_watermark_only_moves_forward(tmp_path):
+    root = str(tmp_path)
+    assert raise_watermark(START_MS, root)
+    assert not raise_watermark(START_MS - 1, root)
+    run_all([threading.Thread(target=raise_watermark, args=(START_MS + i, root)) for i in range(20)])
+    assert read_watermark(root) == START_MS + 19
+
+
+def test_convert_csv_keeps_archived_readings(tmp_path):
+    root = str(tmp_path / "ctd")
+    append_ctd(ctd_rows(0, 4), root)
+    csv = tmp_path / "ERIS_data.csv"
+    rows = pd.concat([ctd_rows(2, 4), ctd_rows(5, 1)], ignore_index=True)
+    rows.assign(date=pd.to_datetime(rows["date"], unit="ms", utc=True)).to_csv(csv, index=False)
+
+    assert convert_csv(str(csv), root) == (2, 3)
+    keys = archived_keys(root)
+    assert len(keys) == len(set(keys)) == 6
@@ -0,0 +1,35 @@
+import pandas as pd
+
+from eris.archive import read_watermark, to_epoch_ms, write_watermark
+from eris.backfill import advance_watermark, shards
+
+
+def days(*shard_list):
+    return [tuple(pd.Timestamp(ms, unit="ms").strftime("%Y-%m-%d") for ms in s) for s in shard_list]
+
+
+def test_month_shards_cover_the_range():
+    assert days(*shards("2025-01-15", "2025-03-10")) == [
+        ("2025-01-15", "2025-02-01"), ("2025-02-01", "2025-03-01"), ("2025-03-01", "2025-03-10"),
+    ]
+    # Boundaries on the range edges do not make empty shards
+    assert days(*shards("2025-01-01", "2025-03-01")) == [("2025-01-01", "2025-02-01"), ("2025-02-01", "2025-03-01")]
+    assert shards("2025-01-01", "2025-01-01") == []
+
+
+def test_week_and_day_shards():
+    # 2025-01-06 is a Monday
+    assert days(*shards("2025-01-01", "2025-01-15", "week")) == [
+        ("2025-01-01", "2025-01-06"), ("2025-01-06", "2025-01-13"), ("2025-01-13", "2025-01-15"),
+    ]
+    assert len(shards("2025-01-01", "2025-02-01", "day")) == 31
+
+
+def test_watermark_moves_only_when_the_backfill_joins_the_synced_data(tmp_path):
+    root = str(tmp_path)
+    mark = to_epoch_ms("2025-01-10")
+    write_watermark(mark, root)
+    # A range starting after the watermark would leave a gap for the sync
+    assert not advance_watermark(to_epoch_ms("2025-02-01"), to_epoch_ms("2025-03-01"), root)
+    assert advance_watermark(to_epoch_ms("2025-01-01"), to_epoch_ms("2025-03-01"), root)
+    assert read_watermark(root) == to_epoch_ms("2025-03-01")
@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+import plotly.graph_objs as go
+import pytest
+
+from eris.charts import add_series, gap_series
+
+NAN = np.nan
+HOUR = np.timedelta64(1, "h")
+
+
+def hours(*offsets):
+    return np.datetime64("2024-01-01T00:00") + np.array(offsets) * HOUR
+
+
+def as_lists(x, y):
+    return x.tolist(), [None if np.isnan(v) else v for v in y]
+
+
+@pytest.mark.parametrize("y", [[], [NAN], [NAN, NAN, NAN]])
+def test_gap_series_without_readings_is_empty(y):
+    x, out = gap_series(hours(*range(len(y))), y, 2 * HOUR)
+    assert len(x) == len(out) == 0
+
+
+def test_gap_series_single_reading():
+    assert as_lists(*gap_series(hours(0), [1.0], 2 * HOUR)) == (hours(0).tolist(), [1.0])
+    assert as_lists(*gap_series(hours(0, 1, 2), [NAN, 1.0, NAN])) == (hours(1).tolist(), [1.0])
+
+
+def test_gap_series_one_separator_per_gap():
+    x = hours(0, 1, 2, 3, 4, 10, 11)
+    y = [1.0, NAN, NAN, 2.0, 3.0, 4.0, NAN]
+    out_x, out_y = as_lists(*gap_series(x, y, 2 * HOUR))
+    # The NaN run collapses to its first NaN; the 6 h pause gets a NaN at its start; the trailing NaN goes
+    assert out_x == hours(0, 1, 3, 4, 4, 10).tolist()
+    assert out_y == [1.0, None, 2.0, 3.0, None, 4.0]
+
+
+def test_long_traces_switch_to_webgl():
+    df = pd.DataFrame({"time": pd.date_range("2024-01-01", periods=50, freq="30min", tz="UTC"), "t": np.arange(50.0)})
+    fig = go.Figure()
+    add_series(fig, df, "time", "t", "T", "red", max_points=None, webgl_threshold=49)
+    add_series(fig, df, "time", "t", "T", "red", max_points=None, webgl_threshold=50)
+    # Downsampled below the threshold, a long series is drawn as SVG again
+    add_series(fig, df, "time", "t", "T", "red", max_points=10, webgl_threshold=49)
+    assert [trace.type for trace in fig.data] == ["scattergl", "scatter", "scatter"]
+    assert len(fig.data[2].x) == 10
@@ -0,0 +1,39 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from eris.downsample import downsample
+
+
+def spiky_series(n=10_000):
+    x = pd.date_range("2024-01-01", periods=n, freq="30min").to_numpy()
+    y = np.sin(np.arange(n) / 100.0)
+    y[n // 2] = 50.0
+    return x, y
+
+
+@pytest.mark.parametrize("method", ["lttb", "minmax"])
+def test_downsample_keeps_shape(method):
+    x, y = spiky_series()
+    idx = downsample(x, y, 100, method)
+    assert len(idx) == 100
+    assert (np.diff(idx) > 0).all()
+    # The end points and the spike survive
+    assert idx[0] == 0 and idx[-1] == len(y) - 1
+    assert len(y) // 2 in idx
+
+
+def test_short_series_are_kept_whole():
+    x, y = spiky_series(50)
+    assert downsample(x, y, 100).tolist() == list(range(50))
+    assert downsample(x[:0], y[:0], 100).tolist() == []
+
+
+def test_missing_runs_keep_one_nan():
+    x, y = spiky_series(1_000)
+    y[100:200] = np.nan
+    idx = downsample(x, y, 50)
+    # The first NaN of the run is kept so the line still breaks there
+    assert np.isnan(y[idx]).sum() == 1 and 100 in idx
+    assert np.isnan(y[downsample(x, y, 50, keep_gaps=False)]).sum() == 0
+    assert downsample(x[:3], [np.nan] * 3, 50).tolist() == [0]
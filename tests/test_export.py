@@ -0,0 +1,38 @@
+import pandas as pd
+
+from eris.archive import append_ctd, clean_ctd_frame
+from eris.dedup import DedupIndex
+from eris.export import archive_export
+
+START_MS = 1_700_000_000_000
+
+
+def ctd_rows(first, count):
+    return clean_ctd_frame(pd.DataFrame({
+        "date": [START_MS + (first + i) * 60_000 for i in range(count)],
+        "instrument": "CTD",
+        "temperature": [float(first + i) for i in range(count)],
+    }))
+
+
+def test_export_is_rebuilt_when_rows_are_added_to_its_range(tmp_path):
+    root, exports = str(tmp_path / "ctd"), str(tmp_path / "exports")
+    start, end = pd.Timestamp(START_MS, unit="ms"), pd.Timestamp(START_MS + 3_600_000, unit="ms")
+    append_ctd(ctd_rows(0, 5), root)
+    first = archive_export(start, end, "csv", root=root, export_dir=exports)
+    assert archive_export(start, end, "csv", root=root, export_dir=exports) == first
+
+    # A late row inside the range does not move the watermark
+    DedupIndex(root).append_new(ctd_rows(10, 1), "late", append_ctd)
+    second = archive_export(start, end, "csv", root=root, export_dir=exports)
+    assert second != first
+    assert len(pd.read_csv(second)) == 6
+
+
+def test_export_survives_changes_to_other_months(tmp_path):
+    root, exports = str(tmp_path / "ctd"), str(tmp_path / "exports")
+    start, end = pd.Timestamp(START_MS, unit="ms"), pd.Timestamp(START_MS + 3_600_000, unit="ms")
+    append_ctd(ctd_rows(0, 5), root)
+    first = archive_export(start, end, "parquet", root=root, export_dir=exports)
+    append_ctd(ctd_rows(60 * 24 * 60, 1), root)  # two months later
+    assert archive_export(start, end, "parquet", root=root, export_dir=exports) == first
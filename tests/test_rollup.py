@@ -0,0 +1,73 @@
+import multiprocessing
+
+import pandas as pd
+
+from eris.archive import append_ctd, clean_ctd_frame
+from eris.rollup import aggregate, choose_resolution, load_rollup, rollup_version, update_months
+
+START_MS = 1_700_000_000_000  # 2023-11-14 22:13:20 UTC
+STEP_MS = 30 * 60 * 1000
+
+
+def ctd_rows(first, count):
+    return clean_ctd_frame(pd.DataFrame({
+        "date": [START_MS + (first + i) * STEP_MS for i in range(count)],
+        "instrument": "CTD",
+        "temperature": [float(first + i) for i in range(count)],
+    }))
+
+
+def update_november(root, rollup_root):
+    for _ in range(5):
+        update_months([(2023, 11)], root, rollup_root)
+
+
+def test_concurrent_updates_publish_complete_rollups(tmp_path):
+    root, rollup_root = str(tmp_path / "ctd"), str(tmp_path / "rollups")
+    append_ctd(ctd_rows(0, 48), root)
+    workers = [multiprocessing.Process(target=update_november, args=(root, rollup_root)) for _ in range(4)]
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+
+    assert [w.exitcode for w in workers] == [0] * 4
+    assert load_rollup("day", rollup_root=rollup_root)["temperature_count"].sum() == 48
+    assert not [p for p in (tmp_path / "rollups").rglob("*.tmp")]
+
+
+def test_rollup_version_changes_with_its_months_only(tmp_path):
+    root, rollup_root = str(tmp_path / "ctd"), str(tmp_path / "rollups")
+    append_ctd(ctd_rows(0, 4), root)
+    update_months([(2023, 11)], root, rollup_root)
+    november = rollup_version("day", "2023-11-01", "2023-12-01", rollup_root)
+    assert len(november) == 1
+
+    append_ctd(ctd_rows(4, 4), root)
+    update_months([(2023, 11)], root, rollup_root)
+    assert rollup_version("day", "2023-11-01", "2023-12-01", rollup_root) != november
+    assert rollup_version("day", "2023-12-01", "2024-01-01", rollup_root) == ()
+
+
+def test_aggregate_skips_empty_buckets():
+    df = pd.concat([ctd_rows(0, 2), ctd_rows(6, 2)], ignore_index=True)
+    df["date"] = pd.to_datetime(df["date"], unit="ms", utc=True)
+    hourly = aggregate(df, "hour")
+
+    assert hourly["date"].dt.strftime("%d %H:%M").tolist() == ["14 22:00", "15 01:00"]
+    assert hourly["temperature_min"].tolist() == [0.0, 6.0]
+    assert hourly["temperature_mean"].tolist() == [0.5, 6.5]
+    assert hourly["temperature_max"].tolist() == [1.0, 7.0]
+    assert hourly["temperature_count"].tolist() == [2, 2]
+    # Sensors without readings count zero
+    assert hourly["salinity_count"].tolist() == [0, 0]
+    assert aggregate(df, "month")["temperature_count"].tolist() == [4]
+
+
+def test_choose_resolution():
+    start = pd.Timestamp("2015-01-01", tz="UTC")
+    assert choose_resolution(start, start + pd.Timedelta(days=7)) == "raw"
+    assert choose_resolution(start, start + pd.Timedelta(days=180)) == "hour"
+    assert choose_resolution(start, start + pd.Timedelta(days=3650)) == "day"
+    assert choose_resolution(start, start + pd.Timedelta(days=20 * 365)) == "month"
+    assert choose_resolution(start, start + pd.Timedelta(days=7), max_rows=200) == "hour"
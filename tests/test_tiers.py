@@ -0,0 +1,80 @@
+from unittest import mock
+
+import pandas as pd
+
+from eris.archive import append_ctd, clean_ctd_frame, to_epoch_ms
+from eris.tiers import TieredCtdCache, quarter_start
+
+
+def day(text):
+    return pd.Timestamp(text, tz="UTC")
+
+
+def ctd_at(*times):
+    return clean_ctd_frame(pd.DataFrame({
+        "date": [to_epoch_ms(day(t)) for t in times],
+        "instrument": "CTD",
+        "temperature": [float(i) for i in range(len(times))],
+    }))
+
+
+class Clock:
+    def __init__(self, today):
+        self.today = day(today)
+
+    def __call__(self):
+        return self.today
+
+
+def dates(df):
+    return [ts.strftime("%Y-%m-%d %H:%M") for ts in df["date"]]
+
+
+def test_quarter_start():
+    assert quarter_start(day("2026-01-01")) == day("2026-01-01")
+    assert quarter_start(day("2026-05-17 13:00")) == day("2026-04-01")
+    assert quarter_start(pd.Timestamp("2026-12-31")) == day("2026-10-01")
+
+
+def test_load_splits_sealed_days_from_today(tmp_path):
+    root = str(tmp_path)
+    append_ctd(ctd_at("2026-03-31 10:00", "2026-05-16 10:00", "2026-05-17 01:00"), root)
+    cache = TieredCtdCache(None, root=root, clock=Clock("2026-05-17"))
+    cache.load()
+
+    assert cache.cold_start == day("2026-04-01")
+    assert dates(cache.cold) == ["2026-05-16 10:00"]
+    assert dates(cache.hot) == ["2026-05-17 01:00"]
+    # Days before the quarter are read from the archive
+    assert dates(cache.frame(day("2026-03-01"))) == ["2026-03-31 10:00", "2026-05-16 10:00", "2026-05-17 01:00"]
+
+
+def test_hot_day_is_promoted_at_midnight(tmp_path):
+    root = str(tmp_path)
+    append_ctd(ctd_at("2026-05-16 10:00", "2026-05-17 01:00"), root)
+    clock = Clock("2026-05-17")
+    cache = TieredCtdCache(None, root=root, clock=clock)
+    cache.load()
+
+    clock.today = day("2026-05-18")
+    new = ctd_at("2026-05-17 23:00", "2026-05-18 00:30")
+    with mock.patch("eris.tiers.sync_ctd", return_value=new) as sync:
+        cache.refresh()
+    assert sync.call_count == 1
+    assert dates(cache.cold) == ["2026-05-16 10:00", "2026-05-17 01:00", "2026-05-17 23:00"]
+    assert dates(cache.hot) == ["2026-05-18 00:30"]
+
+
+def test_new_quarter_evicts_older_days(tmp_path):
+    root = str(tmp_path)
+    append_ctd(ctd_at("2026-06-29 10:00", "2026-06-30 10:00"), root)
+    clock = Clock("2026-06-30")
+    cache = TieredCtdCache(None, root=root, clock=clock)
+    cache.load()
+    assert dates(cache.cold) == ["2026-06-29 10:00"]
+
+    clock.today = day("2026-07-01")
+    cache.load()
+    assert cache.cold_start == day("2026-07-01")
+    assert cache.cold.empty and cache.hot.empty
+    assert dates(cache.frame(day("2026-06-01"))) == ["2026-06-29 10:00", "2026-06-30 10:00"]
@@ -0,0 +1,86 @@
+import pandas as pd
+
+from eris.archive import load_weather
+from eris.weather import import_export
+from eris.weatherlink import parse_times, read_export
+
+# The layout of weatherdata.csv: 12-hour "5:15 PM" times, Solar/UV columns, no dashed row
+WITH_SOLAR = """\
+,,Temp,Hi,Out,Wind,Solar,UV ,Arc.
+Date,Time,Out,Temp,Hum,Dir,Rad.,Index,Int.
+5/13/2024,5:15 PM,20.8,20.8,53,---,0,---,5
+5/13/2024,5:20 PM,20.7,20.8,52,NW,12,0.5,5
+"""
+
+# The layout of new_weather_data.csv: byte order mark, dashed row, "12:05a" times
+WITHOUT_SOLAR = """\
+,,Temp,Hi,Out,Wind,Arc.
+Date,Time,Out,Temp,Hum,Dir,Int.
+--------,-------,-------,-------,-------,------,----
+12/10/2024,12:05a,7.6,7.6,80,ESE,5
+12/10/2024,1:10p,7.7,7.7,79,SE,5
+"""
+
+
+def utc(*stamps):
+    return [pd.Timestamp(s, tz="UTC") for s in stamps]
+
+
+def write(tmp_path, text, encoding="utf-8"):
+    path = tmp_path / "export.csv"
+    path.write_text(text, encoding=encoding)
+    return str(path)
+
+
+def test_export_with_solar_columns(tmp_path):
+    df = read_export(write(tmp_path, WITH_SOLAR), extra=True)
+    assert df["datetime"].tolist() == utc("2024-05-14 00:15", "2024-05-14 00:20")
+    assert df["temp_out"].tolist() == [20.8, 20.7]
+    assert df["temp_hi"].tolist() == [20.8, 20.8]
+    # "---" is a missing value, not text
+    assert df["wind_dir"].isna().tolist() == [True, False]
+    assert df["solar_rad"].tolist() == [0, 12]
+    assert df["uv_index"].isna().tolist() == [True, False]
+
+
+def test_export_with_dashed_row_and_short_times(tmp_path):
+    df = read_export(write(tmp_path, WITHOUT_SOLAR, encoding="utf-8-sig"))
+    assert df["datetime"].tolist() == utc("2024-12-10 08:05", "2024-12-10 21:10")
+    assert df["out_hum"].tolist() == [80.0, 79.0]
+    assert df["wind_dir"].tolist() == ["ESE", "SE"]
+    assert "solar_rad" not in df
+
+
+def test_parse_time_formats():
+    dates = pd.Series(["5/13/2024"] * 5)
+    times = pd.Series(["12:05a", "12:05 AM", "5:15p", "5:15 pm", "17:15"])
+    assert parse_times(dates, times).tolist() == utc(
+        "2024-05-13 07:05", "2024-05-13 07:05", "2024-05-14 00:15", "2024-05-14 00:15", "2024-05-14 00:15"
+    )
+
+
+def test_dst_changes():
+    # 2:30 AM does not exist on 2024-03-10 and is moved to 3:00 PDT
+    assert parse_times(pd.Series(["3/10/2024"]), pd.Series(["2:30a"])).tolist() == utc("2024-03-10 10:00")
+
+    # The repeated hour of 2024-11-03: PDT first, then PST, as logged
+    dates = pd.Series(["11/3/2024"] * 4)
+    times = pd.Series(["12:30a", "1:30a", "1:30a", "2:30a"])
+    assert parse_times(dates, times).tolist() == utc(
+        "2024-11-03 07:30", "2024-11-03 08:30", "2024-11-03 09:30", "2024-11-03 10:30"
+    )
+
+    # A single reading in the repeated hour cannot be placed and is dropped
+    assert parse_times(pd.Series(["11/3/2024"]), pd.Series(["1:30a"])).isna().all()
+
+
+def test_repeated_blocks_are_archived_once(tmp_path):
+    # weatherdata.csv holds the same block of readings three times
+    rows = WITH_SOLAR.splitlines(keepends=True)
+    path = write(tmp_path, "".join(rows[:2] + rows[2:] * 3))
+    assert len(read_export(path)) == 6
+
+    root = str(tmp_path / "weather")
+    assert len(import_export(path, root)) == 2
+    assert len(import_export(path, root)) == 0
+    assert load_weather(root=root)["date"].tolist() == utc("2024-05-14 00:15", "2024-05-14 00:20")